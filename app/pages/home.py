@@ -1,74 +1,70 @@
 import streamlit as st
-import requests
-import time
+import pandas as pd
 import datetime as dt
 from utils.db import read_df
+from utils.instagram import get_instagram_refresher
+from utils.teams import get_game_data_watermark, get_team_dimension
 
 IG_USER_ID = st.secrets["IG_USER_ID"]
 META_PAGE_ACCESS_TOKEN = st.secrets["META_PAGE_ACCESS_TOKEN"]
 
 #st.set_page_config(page_title="BG.Analytics CFB Home", layout="wide")
 
-@st.cache_data(ttl=3600)
-def fetch_ig_metrics_30d(ig_user_id: str, token: str) -> tuple[int, int, int, dict]:
+##############################
+# Upcoming games feed
+UPCOMING_LIMIT = 25
+
+
+def get_conference_options() -> list[str]:
+    """Current FBS conferences, from the shared team dimension."""
+    conferences = get_team_dimension()["conference"].dropna()
+    return sorted(c for c in conferences.unique() if c)
+
+
+@st.cache_resource(max_entries=1)
+def _build_upcoming_feed(watermark: str, eastern_today: str) -> dict[str, pd.DataFrame]:
     """
-    Returns: (accounts_engaged_30d, total_interactions_30d, views_30d, debug_window)
+    Display-ready upcoming games, "All" plus one slice per conference.
+    Rebuilt when the game_data watermark moves (games added or scored) or the Eastern date rolls over.
     """
-    # Last n days
-    until = int(time.time())
-    since = until - 30 * 24 * 60 * 60
-
-    url = f"https://graph.facebook.com/v24.0/{ig_user_id}/insights"
-    params = {
-        "metric": "accounts_engaged,total_interactions,views",
-        "metric_type": "total_value",
-        "period": "day",
-        "since": since,
-        "until": until,
-        "access_token": token,
-    }
-
-    r = requests.get(url, params=params, timeout=30)
-    r.raise_for_status()
-    data = r.json().get("data", [])
-
-    def _total(metric_name: str) -> int:
-        metric = next((m for m in data if m.get("name") == metric_name), None)
-        tv = (metric or {}).get("total_value") or {}
-        return int(tv.get("value", 0))
-
-    debug_window = {
-        "since_unix": since,
-        "until_unix": until,
-        "since_readable": dt.datetime.fromtimestamp(since).strftime("%Y-%m-%d %H:%M:%S"),
-        "until_readable": dt.datetime.fromtimestamp(until).strftime("%Y-%m-%d %H:%M:%S"),
-        "raw_names_returned": [m.get("name") for m in data],
-    }
-
-    return _total("accounts_engaged"), _total("total_interactions"), _total("views"), debug_window
+    # Eastern midnight as a UTC bound keeps the filter on raw startdate (index friendly).
+    since = pd.Timestamp(eastern_today, tz="America/New_York").tz_convert("UTC").to_pydatetime()
+    games = read_df(
+        """
+        SELECT
+            startdate,
+            hometeam AS home,
+            awayteam AS away,
+            homeconference,
+            awayconference
+        FROM public.game_data
+        WHERE startdate >= :since
+          AND (homepoints IS NULL OR awaypoints IS NULL)
+          AND homeclassification = 'fbs'
+          AND awayclassification = 'fbs'
+        ORDER BY startdate ASC
+        """,
+        params={"since": since},
+    )
+    games["Date"] = pd.to_datetime(games["startdate"], utc=True).dt.tz_convert("America/New_York").dt.strftime("%m/%d/%Y")
+    games = games.rename(columns={"home": "Home", "away": "Away"})
 
-##############################
-# Conference finder for filter
-conf_sql = """
-WITH confs AS (
-  SELECT DISTINCT homeconference AS conf
-  FROM public.game_data
-  WHERE homeconference IS NOT NULL AND homeconference <> ''
-    AND homeclassification = 'fbs'
-  UNION
-  SELECT DISTINCT awayconference AS conf
-  FROM public.game_data
-  WHERE awayconference IS NOT NULL AND awayconference <> ''
-    AND awayclassification = 'fbs'
-)
-SELECT conf
-FROM confs
-ORDER BY conf;
-"""
-conf_df = read_df(conf_sql)
-conferences = conf_df["conf"].tolist() if not conf_df.empty else []
-
-FILTER_OPTIONS = ["All"] + conferences
+    def _display(df: pd.DataFrame) -> pd.DataFrame:
+        return df[["Date", "Home", "Away"]].head(UPCOMING_LIMIT).reset_index(drop=True)
+
+    feed = {"All": _display(games)}
+    for conf in get_conference_options():
+        feed[conf] = _display(games[(games["homeconference"] == conf) | (games["awayconference"] == conf)])
+    return feed
+
+
+def get_upcoming_feed() -> dict[str, pd.DataFrame]:
+    eastern_today = pd.Timestamp.now(tz="America/New_York").strftime("%Y-%m-%d")
+    return _build_upcoming_feed(get_game_data_watermark(), eastern_today)
+
+
+upcoming_feed = get_upcoming_feed()
+FILTER_OPTIONS = list(upcoming_feed.keys())
 ##############################
 
 col_left, col_right = st.columns([4, 3])
@@ -119,8 +115,12 @@ with col_left:
         """
     )
 
-    try:
-        accounts_engaged_30d, total_interactions_30d, views_30d, win = fetch_ig_metrics_30d(IG_USER_ID, META_PAGE_ACCESS_TOKEN)
+    # Rendered from the latest stored snapshot; the refresher fetches in the background.
+    snapshot = get_instagram_refresher(IG_USER_ID, META_PAGE_ACCESS_TOKEN).latest_snapshot()
+    if snapshot:
+        metrics = snapshot["metrics"]
+        since_readable = dt.datetime.fromtimestamp(snapshot["since"]).strftime("%Y-%m-%d %H:%M:%S")
+        until_readable = dt.datetime.fromtimestamp(snapshot["until"]).strftime("%Y-%m-%d %H:%M:%S")
 
         st.markdown(
             """
@@ -130,13 +130,13 @@ with col_left:
             """,
             unsafe_allow_html=True
         )
-        st.caption(f"Window used: {win['since_readable']} → {win['until_readable']}")
+        st.caption(f"Window used: {since_readable} → {until_readable}")
         c1, c2, c3 = st.columns(3)
-        c1.metric("Accounts Engaged", f"{accounts_engaged_30d:,}")
-        c2.metric("Interactions", f"{total_interactions_30d:,}")
-        c3.metric("Views", f"{views_30d:,}")
+        c1.metric("Accounts Engaged", f"{metrics['accounts_engaged']:,}")
+        c2.metric("Interactions", f"{metrics['total_interactions']:,}")
+        c3.metric("Views", f"{metrics['views']:,}")
 
-    except Exception as e:
+    else:
         st.info("Instagram stats are temporarily unavailable.")
 
 with col_right:
@@ -158,38 +158,7 @@ with col_right:
         label_visibility="collapsed",
     )
 
-    extra_where = ""
-    params = {}
-
-    if selected_filter != "All":
-        extra_where = """
-          AND (
-            homeconference = :conf
-            OR awayconference = :conf
-          )
-        """
-        params["conf"] = selected_filter
-
-    sql = f"""
-    SELECT
-        TO_CHAR((startdate AT TIME ZONE 'America/New_York')::date, 'MM/DD/YYYY') AS game_date,
-        hometeam AS home,
-        awayteam AS away
-    FROM public.game_data
-    WHERE
-        (homepoints IS NULL OR awaypoints IS NULL)
-        AND (startdate AT TIME ZONE 'America/New_York')::date >= CURRENT_DATE
-        AND homeclassification = 'fbs'
-        AND awayclassification = 'fbs'
-        {extra_where}
-    ORDER BY startdate ASC
-    LIMIT 25;
-    """
-    ##############################
-
-    df = read_df(sql, params=params)
-
-    df = df.rename(columns={"game_date": "Date", "home": "Home", "away": "Away"})
+    df = upcoming_feed.get(selected_filter, upcoming_feed["All"])
     st.dataframe(
         df,
         use_container_width=True,
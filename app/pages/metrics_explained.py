@@ -165,6 +165,47 @@ games = pd.DataFrame([
 ])
 
 TEAM_COLOR = "#9e1b32"
+OPP_COLOR = "#888888"
+
+# The game stepper is a Plotly animation: every game is a precomputed frame, and
+# the slider / buttons inside the figure switch frames in the browser (no reruns).
+FRAME_ARGS = {"mode": "immediate", "frame": {"duration": 0, "redraw": True}, "transition": {"duration": 0}}
+PLAY_ARGS = {"mode": "immediate", "frame": {"duration": 1400, "redraw": True}, "transition": {"duration": 300}, "fromcurrent": True}
+
+
+CONTROLS_HEIGHT = 120  # px below the controls' top edge: button row + slider
+
+
+def animation_controls(frame_names: list[str], labels: list[str], prefix: str, plot_height: int, top: int) -> dict:
+    """
+    Start / Play / Pause / End buttons plus a step slider, all client-side.
+    Placed `top` px below the plot area (paper coordinates scale with plot_height).
+    """
+    return dict(
+        updatemenus=[dict(
+            type="buttons",
+            direction="left",
+            x=0.0, y=-top / plot_height, xanchor="left", yanchor="top",
+            pad=dict(r=10, t=0),
+            showactive=False,
+            buttons=[
+                dict(label="⏮ Start", method="animate", args=[[frame_names[0]], FRAME_ARGS]),
+                dict(label="▶ Play", method="animate", args=[None, PLAY_ARGS]),
+                dict(label="⏸ Pause", method="animate", args=[[None], FRAME_ARGS]),
+                dict(label="⏭ End", method="animate", args=[[frame_names[-1]], FRAME_ARGS]),
+            ],
+        )],
+        sliders=[dict(
+            active=0,
+            x=0.0, y=-(top + 40) / plot_height, len=1.0, xanchor="left", yanchor="top",
+            currentvalue=dict(prefix=prefix),
+            steps=[
+                dict(label=label, method="animate", args=[[name], FRAME_ARGS])
+                for name, label in zip(frame_names, labels)
+            ],
+        )],
+    )
+
 
 def record_through(game_n: int):
     subset = games[games["game"] <= game_n]
@@ -173,41 +214,67 @@ def record_through(game_n: int):
     avg_rating = float(subset["team_rating"].mean()) if len(subset) else 0.0
     return wins, losses, avg_rating
 
-def build_fig(row):
-    y_level = 1
-    opp_color = "#888888"
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=[-40, 40],
-        y=[y_level, y_level],
-        mode="lines",
-        line=dict(width=3),
-        hoverinfo="skip",
-        showlegend=False
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=[row["team_rating"]],
-        y=[y_level],
-        mode="markers+text",
-        marker=dict(size=18, color=TEAM_COLOR),
-        text=[row["team"]],
-        textposition="top center",
-        name=row["team"]
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=[row["opp_rating"]],
-        y=[y_level],
-        mode="markers+text",
-        marker=dict(size=18, color=opp_color),
-        text=[row["opp"]],
-        textposition="bottom center",
-        name=row["opp"]
-    ))
 
+def game_step_annotations(row) -> list[dict]:
+    wins, losses, avg = record_through(int(row["game"]))
+    outcome = "wins" if row["result"] == "W" else "loses"
+    return [
+        dict(
+            text=f"<b>Game {row['game']}: {row['team']} vs {row['opp']}. {row['team']} {outcome}.</b>",
+            xref="paper", yref="paper", x=0.0, y=1.22, xanchor="left", yanchor="bottom",
+            showarrow=False, font=dict(size=17),
+        ),
+        dict(
+            text=f"Record: <b>{wins}-{losses}</b>   |   Average Rating: <b>{avg:.1f}</b>",
+            xref="paper", yref="paper", x=0.0, y=1.06, xanchor="left", yanchor="bottom",
+            showarrow=False, font=dict(size=15),
+        ),
+    ]
+
+
+def game_step_traces(row) -> list[go.Scatter]:
+    y_level = 1
+    return [
+        go.Scatter(
+            x=[-40, 40],
+            y=[y_level, y_level],
+            mode="lines",
+            line=dict(width=3),
+            hoverinfo="skip",
+            showlegend=False
+        ),
+        go.Scatter(
+            x=[row["team_rating"]],
+            y=[y_level],
+            mode="markers+text",
+            marker=dict(size=18, color=TEAM_COLOR),
+            text=[row["team"]],
+            textposition="top center",
+            name=row["team"]
+        ),
+        go.Scatter(
+            x=[row["opp_rating"]],
+            y=[y_level],
+            mode="markers+text",
+            marker=dict(size=18, color=OPP_COLOR),
+            text=[row["opp"]],
+            textposition="bottom center",
+            name=row["opp"]
+        ),
+    ]
+
+
+@st.cache_resource
+def build_game_stepper_figure() -> go.Figure:
+    """One animated figure with a frame per game; shared across sessions, treat as read-only."""
+    rows = games.sort_values("game").to_dict("records")
+    names = [str(int(row["game"])) for row in rows]
+    frames = [
+        go.Frame(name=name, data=game_step_traces(row), layout=dict(annotations=game_step_annotations(row)))
+        for name, row in zip(names, rows)
+    ]
+
+    fig = go.Figure(data=game_step_traces(rows[0]), frames=frames)
     fig.update_yaxes(visible=False, range=[0.5, 1.5])
     fig.update_xaxes(
         title="Game Power Rating",
@@ -215,81 +282,23 @@ def build_fig(row):
         zeroline=True,
         zerolinewidth=2
     )
-    fig.update_layout(height=350, margin=dict(l=20, r=20, t=10, b=40))
+    plot_height, top, controls_top = 250, 90, 55
+    fig.update_layout(
+        height=plot_height + top + controls_top + CONTROLS_HEIGHT,
+        margin=dict(l=20, r=20, t=top, b=controls_top + CONTROLS_HEIGHT),
+        showlegend=False,
+        annotations=game_step_annotations(rows[0]),
+        **animation_controls(names, names, "Game ", plot_height, controls_top),
+    )
     return fig
 
 # -----------------------------
 # UI
 st.markdown("<div style='font-size:2.0rem; font-weight:900;'>Power Ratings: Game-by-Game Visual</div>", unsafe_allow_html=True)
 
-max_game = int(games["game"].max())
-
-if "game_idx" not in st.session_state:
-    st.session_state.game_idx = 1
-
-colL, colR = st.columns([2, 1])
-
-with colR:
-    st.markdown("### Controls")
-
-    c1, c2 = st.columns(2)
-    with c1:
-        if st.button("⏮ Start", use_container_width=True):
-            st.session_state.game_idx = 1
-            st.rerun()
-    with c2:
-        if st.button("⏭ End", use_container_width=True):
-            st.session_state.game_idx = max_game
-            st.rerun()
-
-    c3, c4 = st.columns(2)
-    with c3:
-        if st.button("◀ Prev", use_container_width=True):
-            st.session_state.game_idx = max(1, st.session_state.game_idx - 1)
-            st.rerun()
-    with c4:
-        if st.button("Next ▶", use_container_width=True):
-            st.session_state.game_idx = min(max_game, st.session_state.game_idx + 1)
-            st.rerun()
-
-    st.markdown("---")
-    st.session_state.game_idx = st.slider("Game", 1, max_game, st.session_state.game_idx)
-
-with colL:
-    # Single render per run (no loops = no duplicate element keys)
-    game_n = st.session_state.game_idx
-    row = games.loc[games["game"] == game_n].iloc[0]
-    wins, losses, avg = record_through(game_n)
-
-    outcome = "wins" if row["result"] == "W" else "loses"
-
-    st.markdown(
-        f"""
-        <div style="font-size:1.2rem; font-weight:700; margin-top:0.25rem;">
-          Game {row['game']}: {row['team']} vs {row['opp']}. {row['team']} {outcome}.
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-    st.markdown(
-        f"""
-        <div style="display:flex; gap:20px; align-items:flex-start; margin-top:10px; margin-bottom:10px;">
-          <div style="padding:10px 14px; border:1px solid #ddd; border-radius:12px;">
-            <div style="font-size:0.9rem; color:#666;">Record</div>
-            <div style="font-size:2.0rem; font-weight:900;">{wins}-{losses}</div>
-          </div>
-          <div style="padding:10px 14px; border:1px solid #ddd; border-radius:12px;">
-            <div style="font-size:0.9rem; color:#666;">Average Rating</div>
-            <div style="font-size:2.0rem; font-weight:900;">{avg:.1f}</div>
-          </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-    fig = build_fig(row)
-    st.plotly_chart(fig, use_container_width=True, key="power_rating_stepper_chart")
+_, center, _ = st.columns([1, 4, 1])
+with center:
+    st.plotly_chart(build_game_stepper_figure(), use_container_width=True, key="power_rating_stepper_chart")
 
 st.markdown(textwrap.dedent(f"""
 <div style="font-size:2.3rem; font-weight:900; margin-bottom:1rem;">
@@ -374,10 +383,6 @@ st.markdown(textwrap.dedent(f"""
 # -----------------------------
 # Posterior Story (MANUAL curves)
 # -----------------------------
-import numpy as np
-import plotly.graph_objects as go
-import streamlit as st
-
 st.markdown("<div style='font-size:2.0rem; font-weight:900;'>How we combine preseason and current season data:</div>", unsafe_allow_html=True)
 
 # ----- YOU CONTROL THESE -----
@@ -410,91 +415,10 @@ game_dots = rng.normal(MU_DATA, DOT_SIGMA, size=N_GAMES)
 def normal_pdf(x, mu, sigma):
     return (1.0 / (sigma * np.sqrt(2*np.pi))) * np.exp(-0.5 * ((x - mu)/sigma)**2)
 
-x = np.linspace(X_MIN, X_MAX, 800)
-
-prior_pdf = normal_pdf(x, MU_PRIOR, SIGMA_PRIOR)
-data_pdf  = normal_pdf(x, MU_DATA,  SIGMA_DATA)
-post_pdf  = normal_pdf(x, MU_POST,  SIGMA_POST)
-
-# scale so they sit nicely together
-scale = max(prior_pdf.max(), data_pdf.max(), post_pdf.max())
-prior_y = prior_pdf / scale
-data_y  = data_pdf  / scale
-post_y  = post_pdf  / scale
-
-def build_fig(step: int):
-    """
-    step:
-      0 = prior only
-      1 = explain prior
-      2 = add season dots
-      3 = add season curve
-      4 = add posterior curve
-      5 = recap (show all)
-    """
-    fig = go.Figure()
-
-    # baseline axis line
-    fig.add_trace(go.Scatter(
-        x=[X_MIN, X_MAX], y=[0, 0],
-        mode="lines",
-        line=dict(width=2),
-        hoverinfo="skip",
-        showlegend=False
-    ))
-
-    # Prior
-    fig.add_trace(go.Scatter(
-        x=x, y=prior_y,
-        mode="lines",
-        line=dict(width=4),
-        name="Prior (Preseason belief)"
-    ))
-
-    # Game dots
-    if step >= 2 and SHOW_GAME_DOTS:
-        fig.add_trace(go.Scatter(
-            x=game_dots,
-            y=np.zeros_like(game_dots),
-            mode="markers",
-            marker=dict(size=10),
-            name="Season games (dots)"
-        ))
-
-    # Season curve (game-to-game variation)
-    if step >= 3:
-        fig.add_trace(go.Scatter(
-            x=x, y=data_y,
-            mode="lines",
-            line=dict(width=4, dash="dot"),
-            name="Season evidence (game-to-game)"
-        ))
-
-    # Posterior
-    if step >= 4:
-        fig.add_trace(go.Scatter(
-            x=x, y=post_y,
-            mode="lines",
-            line=dict(width=5),
-            name="Posterior (Updated belief)"
-        ))
-
-    fig.update_layout(
-        height=420,
-        margin=dict(l=25, r=25, t=10, b=45),
-        xaxis=dict(title=METRIC_NAME, range=[X_MIN, X_MAX], zeroline=True, zerolinewidth=2),
-        yaxis=dict(visible=False, range=[-0.15, 1.15]),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0.0)
-    )
 
-    # Mean markers (super helpful for beginners)
-    fig.add_vline(x=MU_PRIOR, line_width=2, line_dash="dash")
-    if step >= 3:
-        fig.add_vline(x=MU_DATA, line_width=2, line_dash="dot")
-    if step >= 4:
-        fig.add_vline(x=MU_POST, line_width=3)
+MAX_STEP = 5
+STEP_LABELS = ["Prior", "Reading the prior", "Season games", "Season evidence", "Updated rating", "Recap"]
 
-    return fig
 
 def step_text(step: int):
     if step == 0:
@@ -546,50 +470,117 @@ def step_text(step: int):
     grow to lean more toward the actual game results as we get sufficient data.
     """
 
-# -----------------------------
-# UI (stepper)
-# -----------------------------
-left, right = st.columns([2, 1])
 
-if "post_step" not in st.session_state:
-    st.session_state.post_step = 0
+def mean_line(mu: float, **line) -> dict:
+    return dict(type="line", xref="x", yref="paper", x0=mu, x1=mu, y0=0, y1=1, line=line)
 
-MAX_STEP = 5
 
-with right:
-    st.markdown("### Controls")
-
-    c1, c2 = st.columns(2)
-    with c1:
-        if st.button("⏮ Start", use_container_width=True, key="manual_post_start"):
-            st.session_state.post_step = 0
-            st.rerun()
-    with c2:
-        if st.button("⏭ End", use_container_width=True, key="manual_post_end"):
-            st.session_state.post_step = MAX_STEP
-            st.rerun()
-
-    c3, c4 = st.columns(2)
-    with c3:
-        if st.button("◀ Prev", use_container_width=True, key="manual_post_prev"):
-            st.session_state.post_step = max(0, st.session_state.post_step - 1)
-            st.rerun()
-    with c4:
-        if st.button("Next ▶", use_container_width=True, key="manual_post_next"):
-            st.session_state.post_step = min(MAX_STEP, st.session_state.post_step + 1)
-            st.rerun()
-
-    st.markdown("---")
-    st.session_state.post_step = st.slider(
+@st.cache_resource
+def build_posterior_story_figures() -> list[go.Figure]:
+    """
+    One figure per step, built once per process:
+      0 = prior only
+      1 = explain prior
+      2 = add season dots
+      3 = add season curve
+      4 = add posterior curve
+      5 = recap (show all)
+    """
+    x = np.linspace(X_MIN, X_MAX, 800)
+
+    prior_pdf = normal_pdf(x, MU_PRIOR, SIGMA_PRIOR)
+    data_pdf  = normal_pdf(x, MU_DATA,  SIGMA_DATA)
+    post_pdf  = normal_pdf(x, MU_POST,  SIGMA_POST)
+
+    # scale so they sit nicely together
+    scale = max(prior_pdf.max(), data_pdf.max(), post_pdf.max())
+    prior_y = prior_pdf / scale
+    data_y  = data_pdf  / scale
+    post_y  = post_pdf  / scale
+
+    def traces(step: int) -> list[go.Scatter]:
+        return [
+            # baseline axis line
+            go.Scatter(
+                x=[X_MIN, X_MAX], y=[0, 0],
+                mode="lines",
+                line=dict(width=2),
+                hoverinfo="skip",
+                showlegend=False
+            ),
+            # Prior
+            go.Scatter(
+                x=x, y=prior_y,
+                mode="lines",
+                line=dict(width=4),
+                name="Prior (Preseason belief)"
+            ),
+            # Game dots
+            go.Scatter(
+                x=game_dots,
+                y=np.zeros_like(game_dots),
+                mode="markers",
+                marker=dict(size=10),
+                name="Season games (dots)",
+                visible=step >= 2 and SHOW_GAME_DOTS,
+            ),
+            # Season curve (game-to-game variation)
+            go.Scatter(
+                x=x, y=data_y,
+                mode="lines",
+                line=dict(width=4, dash="dot"),
+                name="Season evidence (game-to-game)",
+                visible=step >= 3,
+            ),
+            # Posterior
+            go.Scatter(
+                x=x, y=post_y,
+                mode="lines",
+                line=dict(width=5),
+                name="Posterior (Updated belief)",
+                visible=step >= 4,
+            ),
+        ]
+
+    def mean_lines(step: int) -> list[dict]:
+        # Mean markers (super helpful for beginners)
+        shapes = [mean_line(MU_PRIOR, width=2, dash="dash")]
+        if step >= 3:
+            shapes.append(mean_line(MU_DATA, width=2, dash="dot"))
+        if step >= 4:
+            shapes.append(mean_line(MU_POST, width=3))
+        return shapes
+
+    figures = []
+    for step in range(MAX_STEP + 1):
+        fig = go.Figure(data=traces(step))
+        fig.update_layout(
+            height=420,
+            margin=dict(l=25, r=25, t=10, b=45),
+            xaxis=dict(title=METRIC_NAME, range=[X_MIN, X_MAX], zeroline=True, zerolinewidth=2),
+            yaxis=dict(visible=False, range=[-0.15, 1.15]),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0.0),
+            shapes=mean_lines(step),
+        )
+        figures.append(fig)
+    return figures
+
+# -----------------------------
+# UI (stepper)
+# -----------------------------
+@st.fragment
+def render_posterior_story():
+    """The step slider reruns only this fragment; the text and figure for every step are precomputed."""
+    step = st.select_slider(
         "Step",
-        0, MAX_STEP,
-        st.session_state.post_step,
-        key="manual_post_step_slider"
+        options=list(range(MAX_STEP + 1)),
+        format_func=lambda step: STEP_LABELS[step],
+        key="manual_post_step_slider",
     )
+    st.markdown(step_text(step))
+    st.plotly_chart(build_posterior_story_figures()[step], use_container_width=True, key="manual_posterior_story_chart")
 
-    st.markdown("---")
 
-with left:
-    st.markdown(step_text(st.session_state.post_step))
-    fig = build_fig(st.session_state.post_step)
-    st.plotly_chart(fig, use_container_width=True, key="manual_posterior_story_chart")
\ No newline at end of file
+_, center, _ = st.columns([1, 4, 1])
+with center:
+    render_posterior_story()
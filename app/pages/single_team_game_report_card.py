@@ -1,97 +1,26 @@
 import streamlit as st
 import pandas as pd
-from utils.db import read_df
+import numpy as np
+from utils.db import read_arrow_df, read_df
+from utils.grades import (
+    GAME_HEADLINE_STATS,
+    GAME_STAT_CATALOG,
+    game_grade_from_percentile as grade_from_percentile,
+)
+from utils.grade_table import GAME_GRADE_CATALOG, get_game_grades
+from utils.percentiles import build_percentile_index, catalog_percentiles
+from utils.teams import get_team_hex
 
 # ============================
 # STYLING
 # ============================
 
 def _apply_styles() -> None:
-    """Apply all custom CSS for report cards."""
+    """Page-specific layout tweaks; card styles live in styles/report_card.css."""
     st.markdown(
         """
         <style>
           div[data-testid="stSelectbox"] { margin-top: -1rem; }
-          .rc-card {
-            border: 1px solid rgba(49, 51, 63, 0.2);
-            border-radius: 10px;
-            padding: 0.65rem 0.75rem;
-            margin: 0.35rem 0 0.65rem 0;
-            background: rgba(255, 255, 255, 0.02);
-          }
-          .rc-card .rc-head {
-            display: flex;
-            align-items: baseline;
-            justify-content: space-between;
-            margin-bottom: 0.4rem;
-          }
-          .rc-card .rc-title {
-            font-weight: 800;
-            font-size: 1.22rem;
-            letter-spacing: 0.2px;
-            margin: 0;
-          }
-          .rc-grid {
-            display: grid;
-            grid-template-columns: 88px 1fr;
-            gap: 0.35rem 0.6rem;
-            align-items: center;
-          }
-          .rc-grid > div:nth-child(1),
-          .rc-grid > div:nth-child(2) {
-            align-self: end;
-          }
-          .rc-grid > div {
-            padding-bottom: 0.2rem;
-          }
-          .rc-grid > div:not(:nth-last-child(-n+2)) {
-            border-bottom: 1px dashed rgba(49, 51, 63, 0.25);
-          }
-          .rc-pos {
-            font-weight: 700;
-            font-size: 0.92rem;
-          }
-          .rc-pos-wrap {
-            display: flex;
-            flex-direction: column;
-            align-items: flex-start;
-            gap: 0.25rem;
-          }
-          .rc-pos-overall {
-            font-size: 0.78rem;
-            padding: 0.06rem 0.45rem;
-          }
-          .rc-pills {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.35rem;
-            justify-content: center;
-          }
-          .rc-pill {
-            border: 1px solid rgba(49, 51, 63, 0.18);
-            border-radius: 999px;
-            padding: 0.08rem 0.5rem;
-            font-size: 0.82rem;
-            line-height: 1.35;
-            opacity: 0.95;
-            white-space: nowrap;
-          }
-          .rc-pill-grade {
-            border-radius: 999px;
-            padding: 0.08rem 0.55rem;
-            font-size: 0.82rem;
-            line-height: 1.35;
-            font-weight: 800;
-            white-space: nowrap;
-          }
-          .rc-head-grade {
-            border-radius: 999px;
-            padding: 0.14rem 0.6rem;
-            font-size: 1.02rem;
-            font-weight: 900;
-            line-height: 1;
-            display: inline-block;
-          }
         </style>
         """,
         unsafe_allow_html=True
@@ -104,37 +33,6 @@ _apply_styles()
 # DATABASE HELPERS
 # ============================
 
-def get_team_hex(team: str | None) -> str:
-    """Get hex color for a team from team_map."""
-    if not team:
-        return "#4C78A8"
-    df = read_df(
-        """
-        WITH team_ids AS (
-            SELECT homeid::text AS team_id
-            FROM public.game_data
-            WHERE hometeam = :team
-              AND homeid IS NOT NULL
-
-            UNION
-
-            SELECT awayid::text AS team_id
-            FROM public.game_data
-            WHERE awayteam = :team
-              AND awayid IS NOT NULL
-        )
-        SELECT tm."Color"
-        FROM public.team_map tm
-        JOIN team_ids ti
-          ON tm."Id"::text = ti.team_id
-        WHERE tm."Color" IS NOT NULL
-        LIMIT 1
-        """,
-        params={"team": team},
-    )
-    return df["Color"].iloc[0] if not df.empty else "#4C78A8"
-
-
 def get_available_seasons() -> list[int]:
     """Return seasons available in game_data (most recent first)."""
     df = read_df(
@@ -172,115 +70,55 @@ def get_team_game_stats(team: str | None, game_id: str | int | None) -> pd.DataF
 # PERCENTILE HELPER
 # ============================
 
-def league_percentile_for_stat(season: int, stat_col: str, value: float, higher_is_better: bool = True) -> float:
-    """Compute league percentile (0-100) for a value vs all FBS team-games in that season.
+@st.cache_resource(ttl=300)
+def get_game_percentile_index(season: int) -> dict[str, np.ndarray]:
+    """Season baseline for every graded game stat, from one team_advanced_game_stats/game_data join.
 
-    Baseline uses ONLY game-level rows from team_advanced_game_stats joined to game_data.season.
+    Baseline uses ONLY game-level rows from FBS vs FBS games in that season.
     """
-
-    df = read_df(
+    cols = [col for col, _ in GAME_HEADLINE_STATS] + [col for _, col, _ in GAME_STAT_CATALOG]
+    df = read_arrow_df(
         f"""
-        SELECT gs.{stat_col} AS v
+        SELECT {", ".join(f"gs.{col}" for col in cols)}
         FROM public.team_advanced_game_stats gs
         JOIN public.game_data gd
           ON gd.id = gs.game_id
         WHERE gd.season = :season
           AND gd.homeclassification = 'fbs'
           AND gd.awayclassification = 'fbs'
-          AND gs.{stat_col} IS NOT NULL
         """,
         params={"season": int(season)},
     )
+    return build_percentile_index(df, cols)
 
-    # If we have no baseline data, fall back to neutral percentile.
-    if df.empty:
-        return 50.0
-
-    s = df["v"].astype(float)
-    if not higher_is_better:
-        s = -s
-        value = -float(value)
-
-    # Include the current value as an additional observation and compute its percentile rank.
-    s2 = pd.concat([s, pd.Series([float(value)])], ignore_index=True)
-    pct = float(s2.rank(pct=True).iloc[-1]) * 100.0
-    return pct
-
-def grade_from_percentile(pct: float) -> tuple[str, str, str]:
-    """Map percentile (0-100) to (letter, background, foreground)."""
-    if pct >= 94:
-        return ("A+", "#166534", "#FFFFFF")
-    if pct >= 86:
-        return ("A", "#15803d", "#FFFFFF")
-    if pct >= 80:
-        return ("A-", "#16a34a", "#FFFFFF")
-    if pct >= 74:
-        return ("B+", "#4ade80", "#14532d")
-    if pct >= 68:
-        return ("B", "#86efac", "#14532d")
-    if pct >= 62:
-        return ("B-", "#bbf7d0", "#14532d")
-    if pct >= 56:
-        return ("C+", "#fde68a", "#78350f")
-    if pct >= 50:
-        return ("C", "#fcd34d", "#78350f")
-    if pct >= 44:
-        return ("C-", "#fbbf24", "#78350f")
-    if pct >= 38:
-        return ("D+", "#fdba74", "#7c2d12")
-    if pct >= 32:
-        return ("D", "#fb923c", "#7c2d12")
-    if pct >= 26:
-        return ("D-", "#f97316", "#FFFFFF")
-    return ("F", "#dc2626", "#FFFFFF")
 
 # ============================
 # GAME SUMMARY (GOOD/BAD)
 # ============================
 
-# Sample stat catalog (we'll tune these later)
-# key: display label, value: (column_name, higher_is_better)
-GAME_STAT_CATALOG: list[tuple[str, str, bool]] = [
-    ("Offensive Success Rate", "offense_successrate", True),
-    ("Offensive Explosiveness", "offense_explosiveness", True),
-    ("Power Success", "offense_powersuccess", True),
-    ("Line Yards", "offense_lineyards", True),
+PERCENTILE_COLUMNS = ["team", "label", "col", "value", "pct"]
 
-    ("Defensive Success Rate Allowed", "defense_successrate", False),
-    ("Defensive Explosiveness Allowed", "defense_explosiveness", False),
-    ("Stuff Rate", "defense_stuffrate", True),
-]
 
+def compute_game_percentiles(stats: pd.DataFrame, season: int | None) -> pd.DataFrame:
+    """Return a long df with columns: team, label, col, value, pct.
 
-def compute_game_percentiles(
-    stats: pd.DataFrame,
-    season: int,
-    stat_catalog: list[tuple[str, str, bool]] = GAME_STAT_CATALOG,
-) -> pd.DataFrame:
-    """Return a df with columns: label, col, value, pct.
-
-    Percentiles are league-wide for the selected season (all FBS team-games).
+    Grades every team row in `stats` (headline stats plus GAME_STAT_CATALOG) in
+    one batch: each stat is a single vectorized lookup against the season
+    baseline (all FBS team-games) covering every team.
     """
-    if stats.empty:
-        return pd.DataFrame(columns=["label", "col", "value", "pct"])  # empty
-
-    rows: list[dict] = []
-    for label, col, higher_is_better in stat_catalog:
-        if col not in stats.columns:
-            continue
-        v = stats[col].iloc[0]
-        if pd.isna(v):
-            continue
+    if stats.empty or season is None:
+        return pd.DataFrame(columns=PERCENTILE_COLUMNS)
 
-        pct = league_percentile_for_stat(int(season), col, float(v), higher_is_better=higher_is_better)
-        rows.append({"label": label, "col": col, "value": float(v), "pct": float(pct)})
+    index = get_game_percentile_index(int(season))
+    out = catalog_percentiles(index, stats, GAME_GRADE_CATALOG)
+    out["team"] = stats["team"].reindex(out["row"]).to_numpy()
+    return out[PERCENTILE_COLUMNS]
 
-    if not rows:
-        return pd.DataFrame(columns=["label", "col", "value", "pct"])  # empty
 
-    out = pd.DataFrame(rows)
-    out = out.sort_values("pct", ascending=False).reset_index(drop=True)
-    return out
+def materialized_game_percentiles(grades: pd.DataFrame) -> pd.DataFrame:
+    """Same shape as compute_game_percentiles, read from the batch-built grades table."""
+    out = grades[["team", "label", "stat_col", "value", "pct"]].rename(columns={"stat_col": "col"})
+    return out.astype({"value": float, "pct": float})
 
 
 def render_good_bad_panel(
@@ -288,30 +126,29 @@ def render_good_bad_panel(
     season: int | None,
     game_label: str | None,
     team_hex: str,
-    stats: pd.DataFrame,
+    pcts: pd.DataFrame,
     top_n: int = 3,
 ) -> None:
-    """Render a single team panel showing top/bottom percentiles for the selected game."""
+    """Render a single team panel showing top/bottom percentiles for the selected game.
+
+    `pcts` holds this team's graded stats (compute_game_percentiles or
+    materialized_game_percentiles), headline stats included.
+    """
 
     if not team or season is None:
         st.info("Select a game.")
         return
 
-    if stats.empty:
+    if pcts.empty:
         st.info("No game stats for that team/game.")
         return
 
     # Headline percentiles (always shown)
-    off_pct = None
-    def_pct = None
+    pct_by_col = dict(zip(pcts["col"], pcts["pct"].astype(float)))
+    off_pct = pct_by_col.get("offense_ppa")
+    def_pct = pct_by_col.get("defense_ppa")
     overall_pct = None
 
-    if "offense_ppa" in stats.columns and not pd.isna(stats["offense_ppa"].iloc[0]):
-        off_pct = league_percentile_for_stat(int(season), "offense_ppa", float(stats["offense_ppa"].iloc[0]), higher_is_better=True)
-
-    if "defense_ppa" in stats.columns and not pd.isna(stats["defense_ppa"].iloc[0]):
-        def_pct = league_percentile_for_stat(int(season), "defense_ppa", float(stats["defense_ppa"].iloc[0]), higher_is_better=False)
-
     if off_pct is not None and def_pct is not None:
         overall_pct = (float(off_pct) + float(def_pct)) / 2.0
 
@@ -319,7 +156,8 @@ def render_good_bad_panel(
     off_grade = grade_from_percentile(off_pct) if off_pct is not None else None
     def_grade = grade_from_percentile(def_pct) if def_pct is not None else None
 
-    pcts = compute_game_percentiles(stats, int(season))
+    catalog_cols = [col for _, col, _ in GAME_STAT_CATALOG]
+    pcts = pcts[pcts["col"].isin(catalog_cols)].sort_values("pct", ascending=False).reset_index(drop=True)
     if pcts.empty:
         st.info("No comparable stats available for this game.")
         return
@@ -484,15 +322,25 @@ label_b = f"{team_b} ({season_b})" if team_b and season_b else (team_b or "")
 team_hex_a = get_team_hex(team_a)
 team_hex_b = get_team_hex(team_b)
 
+# Materialized grades for both teams in one keyed lookup; raw stats only when missing
+game_grades = get_game_grades(game_id_sel)
+grades_a = game_grades.loc[game_grades["team"] == team_a]
+grades_b = game_grades.loc[game_grades["team"] == team_b]
+
 # Pre-fetch game stats for away/home
-stats_a = get_team_game_stats(team_a, game_id_sel)
-stats_b = get_team_game_stats(team_b, game_id_sel)
+stats_a = get_team_game_stats(team_a, game_id_sel) if grades_a.empty else pd.DataFrame()
+stats_b = get_team_game_stats(team_b, game_id_sel) if grades_b.empty else pd.DataFrame()
+
+# Live grades for both teams in one batch against the season baseline
+live_pcts = compute_game_percentiles(pd.concat([stats_a, stats_b], ignore_index=True), season_sel)
+pcts_a = materialized_game_percentiles(grades_a) if not grades_a.empty else live_pcts.loc[live_pcts["team"] == team_a]
+pcts_b = materialized_game_percentiles(grades_b) if not grades_b.empty else live_pcts.loc[live_pcts["team"] == team_b]
 
 # Render both sides
 out_left, out_right = st.columns(2, gap="large")
 
 with out_left:
-    render_good_bad_panel(team_a, season_a, game_label_sel, team_hex_a, stats_a, top_n=3)
+    render_good_bad_panel(team_a, season_a, game_label_sel, team_hex_a, pcts_a, top_n=3)
 
 with out_right:
-    render_good_bad_panel(team_b, season_b, game_label_sel, team_hex_b, stats_b, top_n=3)
+    render_good_bad_panel(team_b, season_b, game_label_sel, team_hex_b, pcts_b, top_n=3)
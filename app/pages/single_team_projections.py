@@ -1,12 +1,33 @@
 import json
+import hashlib
 import html as html_lib
+import os
+import re
+from functools import partial
+from pathlib import Path
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
 import altair as alt
 import plotly.graph_objects as go
+from utils.colors import probability_css
 from utils.db import read_df
+from utils.logos import logo_src
+from utils.parallel import render_fetch_timings, run_concurrently
+from utils.schema import compiled_statement, get_table_columns, pick_column, quote_identifier
+from utils.season_calendar import get_projection_week
+from utils.season_sim import SIMULATED_PREDICTIONS_TABLE
+from utils.static_assets import vendor_url
+from utils.teams import get_current_season, get_team_hex, get_team_names
+from utils.win_distribution import (
+    add_game,
+    fold_wins,
+    remove_game,
+    team_schedule_outcomes,
+    team_win_distribution,
+    win_distributions,
+)
 
 
 WIN_PROBABILITY_COLUMNS = [
@@ -26,6 +47,11 @@ WIN_PROBABILITY_COLUMNS = [
     (13, "probability_13_wins"),
 ]
 
+# Total variation distance above which the stored distribution is flagged as stale.
+WIN_DISTRIBUTION_STALE_GAP = 0.25
+
+SEASON_PREDICTION_TABLES = ["season_predictions_full", SIMULATED_PREDICTIONS_TABLE]
+
 SEASON_ODDS_COLUMNS = [
     "conference_champion_prob",
     "playoff_prob",
@@ -105,53 +131,6 @@ def donut(probability: float, team_color: str) -> go.Figure:
     return fig
 
 
-def get_team_hex(team: str | None) -> str:
-    if not team:
-        return "#4C78A8"
-    df = read_df(
-        """
-        WITH team_ids AS (
-            SELECT homeid::text AS team_id
-            FROM public.game_data
-            WHERE hometeam = :team
-              AND homeid IS NOT NULL
-
-            UNION
-
-            SELECT awayid::text AS team_id
-            FROM public.game_data
-            WHERE awayteam = :team
-              AND awayid IS NOT NULL
-        )
-        SELECT tm."Color"
-        FROM public.team_map tm
-        JOIN team_ids ti
-          ON tm."Id"::text = ti.team_id
-        WHERE tm."Color" IS NOT NULL
-        LIMIT 1
-        """,
-        params={"team": team},
-    )
-    return df["Color"].iloc[0] if not df.empty else "#4C78A8"
-
-
-def quote_identifier(identifier: str) -> str:
-    return f'"{identifier.replace(chr(34), chr(34) * 2)}"'
-
-
-def get_table_columns(table_name: str) -> set[str]:
-    df = read_df(
-        """
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = 'public'
-          AND table_name = :table_name
-        """,
-        params={"table_name": table_name},
-    )
-    return set(df["column_name"]) if not df.empty else set()
-
-
 def scale_probability(value: float | int | None) -> float:
     if pd.isna(value):
         return 0.0
@@ -162,22 +141,59 @@ def scale_probability(value: float | int | None) -> float:
     return float(np.clip(prob, 0.0, 1.0))
 
 
-def get_season_prediction(team: str | None, season: int | None) -> pd.Series:
+def get_team_games(team: str | None, season: int | None) -> pd.DataFrame:
+    """Team's full schedule (FBS and non-FBS opponents) with the latest successful run's win probability.
+
+    Wins so far count every game; use fbs_games() for the displayed tables.
+    """
     if not team or season is None:
-        return pd.Series(dtype="float64")
+        return pd.DataFrame()
 
-    table_columns = get_table_columns("season_predictions_full")
+    return read_df(
+        """
+        WITH latest_run AS (
+            SELECT game_prediction_run_id
+            FROM public.game_prediction_runs
+            WHERE season = :season
+              AND status = 'success'
+            ORDER BY created_at DESC
+            LIMIT 1
+        )
+        SELECT
+            g.*,
+            p.model_version AS model_version,
+            CASE
+                WHEN g.hometeam = :team THEN p.homewinprob
+                WHEN g.awayteam = :team THEN p.awaywinprob
+                ELSE NULL
+            END AS teamwinprob
+        FROM public.game_data g
+        LEFT JOIN latest_run r
+          ON TRUE
+        LEFT JOIN public.game_predictions_full p
+          ON p.game_prediction_run_id = r.game_prediction_run_id
+         AND p.gameid = g.id::text
+        WHERE g.startdate IS NOT NULL
+          AND (g.hometeam = :team OR g.awayteam = :team)
+        """,
+        params={"team": team, "season": int(season)},
+    )
+
+
+def fbs_games(games: pd.DataFrame) -> pd.DataFrame:
+    """Only games where both teams are FBS."""
+    if games.empty:
+        return games
+    return games[(games["homeclassification"] == "fbs") & (games["awayclassification"] == "fbs")]
+
+
+def _build_season_prediction_sql(table: str) -> str | None:
+    table_columns = get_table_columns(table)
     if not table_columns:
-        return pd.Series(dtype="float64")
+        return None
 
-    team_id_col = next(
-        (col for col in ["team_id", "teamid", "TeamId", "teamId"] if col in table_columns),
-        None,
-    )
-    team_name_col = next(
-        (col for col in ["team", "Team", "school", "school_name"] if col in table_columns),
-        None,
-    )
+    team_id_col = pick_column(table, ["team_id", "teamid", "TeamId", "teamId"])
+    team_name_col = pick_column(table, ["team", "Team", "school", "school_name"])
 
     selected_columns = [
         col
@@ -186,7 +202,7 @@ def get_season_prediction(team: str | None, season: int | None) -> pd.Series:
     ] + [col for col in SEASON_ODDS_COLUMNS if col in table_columns]
 
     if not selected_columns or (team_id_col is None and team_name_col is None):
-        return pd.Series(dtype="float64")
+        return None
 
     select_sql = ",\n            ".join(f"sp.{quote_identifier(col)}" for col in selected_columns)
     season_sql = 'AND sp."season" = :season' if "season" in table_columns else ""
@@ -219,7 +235,7 @@ def get_season_prediction(team: str | None, season: int | None) -> pd.Series:
     )
 
     if team_id_col is not None:
-        sql = f"""
+        return f"""
         WITH team_ids AS (
             SELECT homeid::text AS team_id, MAX(season) AS last_seen
             FROM public.game_data
@@ -243,7 +259,7 @@ def get_season_prediction(team: str | None, season: int | None) -> pd.Series:
         )
         SELECT
             {select_sql}
-        FROM public.season_predictions_full sp
+        FROM public.{table} sp
         JOIN selected_team_id ti
           ON sp.{quote_identifier(team_id_col)}::text = ti.team_id
         {run_join_sql}
@@ -252,22 +268,32 @@ def get_season_prediction(team: str | None, season: int | None) -> pd.Series:
         {order_sql}
         LIMIT 1
         """
-        params = {"team": team, "season": int(season)}
-    else:
-        sql = f"""
+
+    return f"""
         SELECT
             {select_sql}
-        FROM public.season_predictions_full sp
+        FROM public.{table} sp
         {run_join_sql}
         WHERE sp.{quote_identifier(team_name_col)} = :team
           {season_sql}
         {order_sql}
         LIMIT 1
         """
-        params = {"team": team, "season": int(season)}
 
-    df = read_df(sql, params=params)
-    return df.iloc[0] if not df.empty else pd.Series(dtype="float64")
+
+def get_season_prediction(team: str | None, season: int | None) -> pd.Series:
+    if not team or season is None:
+        return pd.Series(dtype="float64")
+
+    # External pipeline first, then the in-repo simulator (utils.season_sim).
+    for table in SEASON_PREDICTION_TABLES:
+        sql = compiled_statement(f"season_prediction:{table}", partial(_build_season_prediction_sql, table))
+        if sql is None:
+            continue
+        df = read_df(sql, params={"team": team, "season": int(season)})
+        if not df.empty:
+            return df.iloc[0]
+    return pd.Series(dtype="float64")
 
 
 def get_latest_ranking_projection(team: str | None, season: int | None) -> pd.Series:
@@ -276,33 +302,23 @@ def get_latest_ranking_projection(team: str | None, season: int | None) -> pd.Se
 
     df = read_df(
         """
-        WITH latest_row AS (
-            SELECT
-                rp.*,
-                COALESCE(
-                    (
-                        SELECT MAX(g.week)::int + 1
-                        FROM public.game_data g
-                        WHERE g.season = rp.season
-                          AND g.week IS NOT NULL
-                          AND g.startdate IS NOT NULL
-                          AND (g.startdate AT TIME ZONE 'America/New_York')::date <= rp.run_date::date
-                    ),
-                    1
-                ) AS projection_week
-            FROM public.ranking_projections_full rp
-            WHERE rp.season = :season
-              AND rp.team = :team
-              AND LOWER(COALESCE(rp.classification, '')) = 'fbs'
-            ORDER BY rp.run_date DESC, rp.created_at DESC, rp.ranking_projection_run_id DESC
-            LIMIT 1
-        )
-        SELECT *
-        FROM latest_row
+        SELECT rp.*
+        FROM public.ranking_projections_full rp
+        WHERE rp.season = :season
+          AND rp.team = :team
+          AND LOWER(COALESCE(rp.classification, '')) = 'fbs'
+        ORDER BY rp.run_date DESC, rp.created_at DESC, rp.ranking_projection_run_id DESC
+        LIMIT 1
         """,
         params={"team": team, "season": int(season)},
     )
-    return df.iloc[0] if not df.empty else pd.Series(dtype="object")
+    if df.empty:
+        return pd.Series(dtype="object")
+
+    row = df.iloc[0].copy()
+    # Resolved against the cached season calendar instead of a per-row game_data scan.
+    row["projection_week"] = get_projection_week(season, row.get("run_date"))
+    return row
 
 
 def get_poll_ranking_history(team: str | None, season: int | None, poll: str) -> pd.DataFrame:
@@ -330,43 +346,17 @@ def get_poll_ranking_history(team: str | None, season: int | None, poll: str) ->
     return df.dropna(subset=["week", "ranking"]).sort_values("week")
 
 
-def get_schedule_map_data(team: str | None, season: int | None) -> pd.DataFrame:
-    if not team or season is None:
-        return pd.DataFrame()
-
-    venue_columns = get_table_columns("venue_map")
-    if not venue_columns:
-        return pd.DataFrame()
-
-    venue_id_col = next(
-        (col for col in ["Id", "id", "VenueId", "venueid", "venue_id"] if col in venue_columns),
-        None,
-    )
-    latitude_col = next(
-        (col for col in ["Latitude", "latitude", "lat"] if col in venue_columns),
-        None,
-    )
-    longitude_col = next(
-        (col for col in ["Longitude", "longitude", "lng", "lon"] if col in venue_columns),
-        None,
-    )
-    venue_name_col = next(
-        (col for col in ["Name", "name", "Venue", "venue", "venue_name"] if col in venue_columns),
-        None,
-    )
+def _build_schedule_map_sql() -> str | None:
+    venue_id_col = pick_column("venue_map", ["Id", "id", "VenueId", "venueid", "venue_id"])
+    latitude_col = pick_column("venue_map", ["Latitude", "latitude", "lat"])
+    longitude_col = pick_column("venue_map", ["Longitude", "longitude", "lng", "lon"])
+    venue_name_col = pick_column("venue_map", ["Name", "name", "Venue", "venue", "venue_name"])
 
     if venue_id_col is None or latitude_col is None or longitude_col is None:
-        return pd.DataFrame()
+        return None
 
-    team_columns = get_table_columns("team_map")
-    team_id_col = next(
-        (col for col in ["Id", "id", "TeamId", "teamId", "team_id"] if col in team_columns),
-        None,
-    )
-    logo_col = next(
-        (col for col in ["Logo", "logo", "logo_url", "Logo_URL"] if col in team_columns),
-        None,
-    )
+    team_id_col = pick_column("team_map", ["Id", "id", "TeamId", "teamId", "team_id"])
+    logo_col = pick_column("team_map", ["Logo", "logo", "logo_url", "Logo_URL"])
     venue_name_sql = (
         f"v.{quote_identifier(venue_name_col)} AS venue_name"
         if venue_name_col
@@ -387,8 +377,7 @@ def get_schedule_map_data(team: str | None, season: int | None) -> pd.DataFrame:
         else ""
     )
 
-    df = read_df(
-        f"""
+    return f"""
         SELECT
             g.id,
             g.week,
@@ -420,9 +409,18 @@ def get_schedule_map_data(team: str | None, season: int | None) -> pd.DataFrame:
           AND g.venueid IS NOT NULL
           AND (g.hometeam = :team OR g.awayteam = :team)
         ORDER BY g.startdate
-        """,
-        params={"team": team, "season": int(season)},
-    )
+        """
+
+
+def get_schedule_map_data(team: str | None, season: int | None) -> pd.DataFrame:
+    if not team or season is None:
+        return pd.DataFrame()
+
+    sql = compiled_statement("schedule_map", _build_schedule_map_sql)
+    if sql is None:
+        return pd.DataFrame()
+
+    df = read_df(sql, params={"team": team, "season": int(season)})
     if df.empty:
         return df
 
@@ -461,39 +459,74 @@ def get_schedule_map_data(team: str | None, season: int | None) -> pd.DataFrame:
     return df
 
 
-def build_schedule_map(schedule_df: pd.DataFrame, team: str) -> str:
-    if schedule_df.empty:
-        return ""
+LEAFLET_VERSION = "1.9.3"
+LEAFLET_CDN = f"https://unpkg.com/leaflet@{LEAFLET_VERSION}/dist"
+SCHEDULE_MAP_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "schedule_maps"
+# Bump when the map template changes so cached documents are rebuilt.
+SCHEDULE_MAP_TEMPLATE_VERSION = 1
 
-    route_df = schedule_df.sort_values("game_number").reset_index(drop=True)
-    games = []
-    for _, row in route_df.iterrows():
-        logo = row.get("opponent_logo")
-        games.append(
-            {
-                "gameNumber": int(row["game_number"]),
-                "lat": float(row["map_latitude"]),
-                "lon": float(row["map_longitude"]),
-                "matchup": str(row["matchup"]),
-                "opponent": str(row["opponent"]),
-                "venue": str(row["venue_name"]) if pd.notna(row["venue_name"]) else "Unknown venue",
-                "date": str(row["date_label"]),
-                "result": str(row["result_label"]),
-                "locationType": str(row["location_type"]),
-                "logo": str(logo) if pd.notna(logo) and str(logo).strip() else None,
-            }
-        )
+
+def schedule_map_games(schedule_df: pd.DataFrame) -> list[dict]:
+    """Marker payload for the map, one JSON-ready dict per game in schedule order."""
+    route_df = schedule_df.sort_values("game_number")
+    logos = route_df["opponent_logo"].map(logo_src).astype(object)
+    return pd.DataFrame(
+        {
+            "gameNumber": route_df["game_number"].astype(int),
+            "lat": route_df["map_latitude"].astype(float),
+            "lon": route_df["map_longitude"].astype(float),
+            "matchup": route_df["matchup"].astype(str),
+            "opponent": route_df["opponent"].astype(str),
+            "venue": route_df["venue_name"].fillna("Unknown venue").astype(str),
+            "date": route_df["date_label"].astype(str),
+            "result": route_df["result_label"].astype(str),
+            "locationType": route_df["location_type"].astype(str),
+            # None (not NaN) so the JSON payload stays valid
+            "logo": logos.where(logos.notna(), None),
+        }
+    ).to_dict("records")
+
+
+def get_schedule_map_html(schedule_df: pd.DataFrame, team: str, season: int) -> str:
+    """
+    Map document memoized on disk by (team, season, schedule hash);
+    the hash covers the marker payload, so new results or logos rebuild it.
+    """
+    games = schedule_map_games(schedule_df)
+    payload = json.dumps([SCHEDULE_MAP_TEMPLATE_VERSION, games], sort_keys=True)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    prefix = f"{re.sub(r'[^A-Za-z0-9]+', '_', team).strip('_')}_{int(season)}_"
+    path = SCHEDULE_MAP_CACHE_DIR / f"{prefix}{digest}.html"
+    if path.exists():
+        return path.read_text()
+
+    map_html = build_schedule_map(games, team)
+    SCHEDULE_MAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in SCHEDULE_MAP_CACHE_DIR.glob(f"{prefix}*.html"):
+        stale.unlink(missing_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(map_html)
+    os.replace(tmp_path, path)
+    return map_html
+
+
+def build_schedule_map(games: list[dict], team: str) -> str:
+    if not games:
+        return ""
 
     games_json = json.dumps(games)
     title = html_lib.escape(f"{team} Schedule Map")
+    # Local bundle via static serving; the CDN is only a fallback.
+    leaflet_local = vendor_url(f"leaflet-{LEAFLET_VERSION}")
 
     return f"""
     <!doctype html>
     <html>
     <head>
       <meta charset="utf-8" />
-      <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-      <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+      <link rel="stylesheet" href="{leaflet_local}/leaflet.css" onerror="this.onerror=null; this.href='{LEAFLET_CDN}/leaflet.css';" />
+      <script src="{leaflet_local}/leaflet.js"></script>
+      <script>window.L || document.write('<script src="{LEAFLET_CDN}/leaflet.js"><\\/script>');</script>
       <style>
         html, body {{ margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; }}
         .map-wrap {{ width: 100%; height: 470px; position: relative; background: #f8fafc; }}
@@ -683,19 +716,90 @@ def build_schedule_map(schedule_df: pd.DataFrame, team: str) -> str:
     """
 
 
-def build_win_distribution(season_prediction: pd.Series) -> pd.DataFrame:
+def build_win_distribution(season_prediction: pd.Series, computed: pd.Series | None = None) -> pd.DataFrame:
+    """Stored season distribution, or the one computed from per-game probabilities when there is none."""
+    probabilities = [
+        scale_probability(season_prediction.get(column, 0.0))
+        for _, column in WIN_PROBABILITY_COLUMNS
+    ]
+    if sum(probabilities) == 0 and computed is not None:
+        probabilities = [float(computed.get(wins, 0.0)) for wins, _ in WIN_PROBABILITY_COLUMNS]
+
     dist_df = pd.DataFrame(
         {
             "Wins": [str(wins) for wins, _ in WIN_PROBABILITY_COLUMNS],
-            "Probability": [
-                scale_probability(season_prediction.get(column, 0.0))
-                for _, column in WIN_PROBABILITY_COLUMNS
-            ],
+            "Probability": probabilities,
         }
     )
     return dist_df
 
 
+def win_distribution_gap(dist_df: pd.DataFrame, computed: pd.Series | None) -> float:
+    """Total variation distance between the shown distribution and the per-game one (0 = identical)."""
+    if computed is None:
+        return 0.0
+    computed_probs = np.array([float(computed.get(wins, 0.0)) for wins, _ in WIN_PROBABILITY_COLUMNS])
+    return float(0.5 * np.abs(dist_df["Probability"].to_numpy(dtype=float) - computed_probs).sum())
+
+
+WHAT_IF_OPTIONS = ["Model", "Win", "Loss"]
+
+
+def pinned_probability(model_prob: float, outcome: str | None) -> float:
+    return {"Win": 1.0, "Loss": 0.0}.get(outcome, model_prob)
+
+
+def what_if_distribution(
+    state_key: tuple,
+    base_dist: np.ndarray,
+    model_probs: dict[str, float],
+    pins: dict[str, str],
+) -> np.ndarray:
+    """Session-held scenario distribution, updated one game factor at a time as pins change."""
+    state = st.session_state.get("what_if_state")
+    if state is None or state["key"] != state_key:
+        state = {"key": state_key, "dist": base_dist, "applied": {}}
+
+    dist = state["dist"]
+    for game_id, model_prob in model_probs.items():
+        old = state["applied"].get(game_id, "Model")
+        new = pins.get(game_id, "Model")
+        if old != new:
+            dist = add_game(
+                remove_game(dist, pinned_probability(model_prob, old)),
+                pinned_probability(model_prob, new),
+            )
+
+    state["dist"] = dist
+    state["applied"] = dict(pins)
+    st.session_state["what_if_state"] = state
+    return dist
+
+
+def render_what_if_controls(team_games: pd.DataFrame, outcomes: pd.DataFrame, team: str) -> dict[str, str]:
+    """Per-game Model / Win / Loss pins for the remaining games; returns {game_id: outcome}."""
+    remaining = outcomes[outcomes["won"].isna()]
+    if remaining.empty or remaining["win_prob"].isna().any():
+        return {}
+
+    games_by_id = {str(game["id"]): game for game in team_games.to_dict("records")}
+    pins: dict[str, str] = {}
+    with st.expander("What-if: pin upcoming results"):
+        for game_id in remaining["game_id"]:
+            game = games_by_id.get(game_id, {})
+            opponent = game.get("awayteam") if game.get("hometeam") == team else game.get("hometeam")
+            prefix = "vs" if game.get("hometeam") == team else "at"
+            start = game.get("startdate")
+            date_label = start.tz_convert("America/New_York").strftime("%m/%d") if pd.notna(start) else ""
+            pins[game_id] = st.segmented_control(
+                f"{date_label} {prefix} {opponent}",
+                options=WHAT_IF_OPTIONS,
+                default="Model",
+                key=f"what_if_{team}_{game_id}",
+            ) or "Model"
+    return pins
+
+
 def render_odds_donut(title: str, probability: float, team_color: str) -> None:
     st.markdown(
         f"<div style='text-align:center; font-size:18px; font-weight:600;'>{title}</div>",
@@ -714,109 +818,74 @@ def format_rank(value: float | int | None) -> str:
     return f"#{int(round(float(value)))}"
 
 
-def win_probability_style(probability: float) -> str:
-    if pd.isna(probability):
-        return "background-color: #d1d5db; color: #374151;"
-
-    prob = float(np.clip(probability, 0.0, 1.0))
-
-    if prob <= 0.5:
-        ratio = prob / 0.5
-        start = np.array([220, 38, 38])
-        end = np.array([250, 204, 21])
-    else:
-        ratio = (prob - 0.5) / 0.5
-        start = np.array([250, 204, 21])
-        end = np.array([22, 163, 74])
-
-    red, green, blue = (start + (end - start) * ratio).astype(int)
-    text_color = "#111827" if 0.25 <= prob <= 0.75 else "#ffffff"
-    return f"background-color: rgb({red}, {green}, {blue}); color: {text_color};"
-
-
-# ----------------------------
-# Data for dropdown
-# ----------------------------
-game_data = read_df(
-    """
-    SELECT *
-    FROM public.game_data
-    WHERE startdate IS NOT NULL
-      AND homeclassification = 'fbs'
-      AND awayclassification = 'fbs'
-    """
-)
-current_season = int(game_data["season"].max())
-teams = sorted(pd.concat([game_data["hometeam"], game_data["awayteam"]]).dropna().unique())
-
-
-# ----------------------------
-# Header: dropdown + title
-# ----------------------------
-col1, col2, col3 = st.columns([1, 2, 1])
-with col2:
-    selected_team = st.selectbox("", options=teams, index=None, placeholder="Select a team")
-
-team_hex = get_team_hex(selected_team)
-team_label = selected_team or ""
-
-st.markdown(
-    f"""
-    <h1 style='text-align:left; margin-top:-1.5rem; margin-bottom:0.25rem;'>
-      Single Team Projections for: {team_label}
-    </h1>
-    """,
-    unsafe_allow_html=True,
-)
-
-
 # ----------------------------
-# Main content (only after team selected)
+# Page sections
 # ----------------------------
-if selected_team:
-    now = pd.Timestamp.now(tz="UTC")
-
-    # Team games + win probabilities
-    team_games = read_df(
-        """
-        WITH latest_run AS (
-            SELECT game_prediction_run_id
-            FROM public.game_prediction_runs
-            WHERE season = :season
-              AND status = 'success'
-            ORDER BY created_at DESC
-            LIMIT 1
+# Interactive sections are fragments: a widget inside one reruns only that
+# section, replaying it with the arguments it was last called with. Every input
+# is passed in explicitly, so a fragment never reads page-level variables.
+def render_upcoming_games(upcoming_games: pd.DataFrame, team: str) -> None:
+    st.subheader(f"Upcoming Games for {team}")
+    upcoming_start_et = upcoming_games["startdate"].dt.tz_convert("America/New_York")
+    upcoming_display = (
+        upcoming_games.assign(
+            Date=upcoming_start_et.dt.strftime("%m/%d/%Y"),
+            Time=upcoming_start_et.dt.strftime("%-I:%M %p"),
+            win_probability=pd.to_numeric(upcoming_games["teamwinprob"], errors="coerce"),
+        )[
+            ["Date", "Time", "hometeam", "awayteam", "win_probability", "model_version"]
+        ].rename(
+            columns={
+                "hometeam": "Home Team",
+                "awayteam": "Away Team",
+                "win_probability": "Win Probability",
+                "model_version": "Model Version",
+            }
         )
-        SELECT
-            g.*,
-            p.model_version AS model_version,
-            CASE
-                WHEN g.hometeam = :team THEN p.homewinprob
-                WHEN g.awayteam = :team THEN p.awaywinprob
-                ELSE NULL
-            END AS teamwinprob
-        FROM public.game_data g
-        LEFT JOIN latest_run r
-          ON TRUE
-        LEFT JOIN public.game_predictions_full p
-          ON p.game_prediction_run_id = r.game_prediction_run_id
-         AND p.gameid = g.id::text
-        WHERE g.startdate IS NOT NULL
-          AND (g.hometeam = :team OR g.awayteam = :team)
-          AND g.homeclassification = 'fbs'
-          AND g.awayclassification = 'fbs'
-        """,
-        params={"team": selected_team, "season": current_season},
     )
 
-    team_games["startdate"] = pd.to_datetime(team_games["startdate"], utc=True)
+    st.dataframe(
+        upcoming_display.style.apply(probability_css, subset=["Win Probability"]),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Win Probability": st.column_config.NumberColumn("Win Probability", format="percent"),
+        },
+    )
+
 
-    # Upcoming games
-    upcoming_games = team_games[team_games["startdate"] > now].sort_values("startdate")
+@st.fragment
+def render_season_outlook(
+    team: str,
+    season: int,
+    team_games: pd.DataFrame,
+    upcoming_games: pd.DataFrame,
+    season_prediction: pd.Series,
+    team_color: str,
+) -> None:
+    """What-if pins, upcoming games, win distribution and odds donuts; reruns alone when a pin changes."""
+    # Exact distribution from wins so far + remaining per-game probabilities (no extra query).
+    outcomes = team_schedule_outcomes(team_games, team, season)
+    computed_dist = win_distributions(outcomes)
+    computed_wins = computed_dist.iloc[0] if not computed_dist.empty else None
+    dist_df = build_win_distribution(season_prediction, computed_wins)
+    stored_dist_used = any(
+        scale_probability(season_prediction.get(column, 0.0)) > 0 for _, column in WIN_PROBABILITY_COLUMNS
+    )
 
-    # Season-long projections
-    season_prediction = get_season_prediction(selected_team, current_season)
-    dist_df = build_win_distribution(season_prediction)
+    # What-if: pinned outcomes replace the computed distribution
+    what_if_pins = render_what_if_controls(team_games, outcomes, team)
+    what_if_active = any(outcome != "Model" for outcome in what_if_pins.values())
+    if what_if_active:
+        remaining = outcomes[outcomes["won"].isna()]
+        model_probs = dict(zip(remaining["game_id"], remaining["win_prob"].astype(float)))
+        scenario = what_if_distribution(
+            (team, season, tuple(model_probs.items())),
+            team_win_distribution(outcomes),
+            model_probs,
+            what_if_pins,
+        )
+        dist_df = dist_df.assign(Probability=fold_wins(scenario, len(WIN_PROBABILITY_COLUMNS) - 1))
     bowl_prob = float(dist_df.loc[dist_df["Wins"].astype(int) >= 6, "Probability"].sum())
     conference_champion_prob = scale_probability(
         season_prediction.get("conference_champion_prob", 0.0)
@@ -825,48 +894,21 @@ if selected_team:
     national_champion_prob = scale_probability(
         season_prediction.get("national_champion_prob", 0.0)
     )
-    latest_ranking_projection = get_latest_ranking_projection(selected_team, current_season)
-    schedule_map_df = get_schedule_map_data(selected_team, current_season)
 
     # Layout: table + bar chart
     left_col, right_col = st.columns(2)
 
     with left_col:
-        st.subheader(f"Upcoming Games for {selected_team}")
-        upcoming_start_et = upcoming_games["startdate"].dt.tz_convert("America/New_York")
-        upcoming_display = (
-            upcoming_games.assign(
-                Date=upcoming_start_et.dt.strftime("%m/%d/%Y"),
-                Time=upcoming_start_et.dt.strftime("%-I:%M %p"),
-                win_probability=pd.to_numeric(upcoming_games["teamwinprob"], errors="coerce"),
-            )[
-                ["Date", "Time", "hometeam", "awayteam", "win_probability", "model_version"]
-            ].rename(
-                columns={
-                    "hometeam": "Home Team",
-                    "awayteam": "Away Team",
-                    "win_probability": "Win Probability",
-                    "model_version": "Model Version",
-                }
-            )
-        )
-
-        st.dataframe(
-            upcoming_display.style
-            .format({"Win Probability": lambda x: "NA" if pd.isna(x) else f"{x:.1%}"})
-            .applymap(win_probability_style, subset=["Win Probability"]),
-            hide_index=True,
-            use_container_width=True,
-        )
+        render_upcoming_games(upcoming_games, team)
 
     with right_col:
         st.subheader("Projected Regular-Season Win Distribution")
         if dist_df["Probability"].sum() == 0:
-            st.info(f"No season prediction found for {selected_team} in {current_season}.")
+            st.info(f"No season prediction found for {team} in {season}.")
         else:
             chart = (
                 alt.Chart(dist_df)
-                .mark_bar(color=team_hex)
+                .mark_bar(color=team_color)
                 .encode(
                     x=alt.X("Wins:N", title="Final Regular-Season Wins", sort=[str(i) for i in range(14)]),
                     y=alt.Y("Probability:Q", title="Probability"),
@@ -874,137 +916,233 @@ if selected_team:
                 )
             )
             st.altair_chart(chart, use_container_width=True)
+            if what_if_active:
+                pinned = sum(outcome != "Model" for outcome in what_if_pins.values())
+                st.caption(f"What-if scenario: {pinned} pinned result{'s' if pinned != 1 else ''}, other games at model odds.")
+            elif not stored_dist_used:
+                st.caption("Computed from wins so far and the latest per-game win probabilities.")
+            elif win_distribution_gap(dist_df, computed_wins) > WIN_DISTRIBUTION_STALE_GAP:
+                st.caption("Stored season projection differs from the latest per-game win probabilities; it may be stale.")
 
     # Bottom: season projection odds
     pie1col, pie2col, pie3col, pie4col = st.columns(4)
 
     with pie1col:
-        render_odds_donut("Bowl Eligibility Odds", bowl_prob, team_hex)
+        render_odds_donut("Bowl Eligibility Odds", bowl_prob, team_color)
 
     with pie2col:
-        render_odds_donut("Conference Champion Odds", conference_champion_prob, team_hex)
+        render_odds_donut("Conference Champion Odds", conference_champion_prob, team_color)
 
     with pie3col:
-        render_odds_donut("CFP Team Odds", playoff_prob, team_hex)
+        render_odds_donut("CFP Team Odds", playoff_prob, team_color)
 
     with pie4col:
-        render_odds_donut("National Champion Odds", national_champion_prob, team_hex)
+        render_odds_donut("National Champion Odds", national_champion_prob, team_color)
+
+
+@st.fragment
+def render_ranking_projection(
+    team: str,
+    ranking_projection: pd.Series,
+    poll_histories: dict[str, pd.DataFrame],
+    team_color: str,
+) -> None:
+    """AP/CFP projected ranking and poll history; the type toggle reruns only this section."""
+    ranking_choice = st.radio(
+        "Ranking Type",
+        options=list(RANKING_OPTIONS.keys()),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="ranking_projection_type",
+    )
+    ranking_option = RANKING_OPTIONS[ranking_choice]
+    projected_col = ranking_option["projected_column"]
+    projected_end_col = ranking_option["projected_end_column"]
+    current_col = ranking_option["current_column"]
+    rank_label = ranking_option["label"]
+    poll_history = poll_histories[ranking_choice]
+    projected_rank = ranking_projection.get(projected_col, np.nan)
+    projected_end_rank = ranking_projection.get(projected_end_col, np.nan)
+    current_rank = ranking_projection.get(current_col, np.nan)
+    projection_week = ranking_projection.get("projection_week", np.nan)
+    run_date = ranking_projection.get("run_date", None)
+    run_type = ranking_projection.get("run_type", None)
+    model_version = ranking_projection.get("model_version", None)
 
-    ranking_left, ranking_right = st.columns(2)
+    st.markdown(
+        f"<div style='font-size:20px; font-weight:700;'>Projected {rank_label} Ranking: {format_rank(projected_rank)}</div>",
+        unsafe_allow_html=True,
+    )
 
-    with ranking_left:
-        ranking_choice = st.radio(
-            "Ranking Type",
-            options=list(RANKING_OPTIONS.keys()),
-            horizontal=True,
-            label_visibility="collapsed",
-            key="ranking_projection_type",
-        )
-        ranking_option = RANKING_OPTIONS[ranking_choice]
-        poll = ranking_option["poll"]
-        projected_col = ranking_option["projected_column"]
-        projected_end_col = ranking_option["projected_end_column"]
-        current_col = ranking_option["current_column"]
-        rank_label = ranking_option["label"]
-        poll_history = get_poll_ranking_history(selected_team, current_season, poll)
-        projected_rank = latest_ranking_projection.get(projected_col, np.nan)
-        projected_end_rank = latest_ranking_projection.get(projected_end_col, np.nan)
-        current_rank = latest_ranking_projection.get(current_col, np.nan)
-        projection_week = latest_ranking_projection.get("projection_week", np.nan)
-        run_date = latest_ranking_projection.get("run_date", None)
-        run_type = latest_ranking_projection.get("run_type", None)
-        model_version = latest_ranking_projection.get("model_version", None)
-
-        st.markdown(
-            f"<div style='font-size:20px; font-weight:700;'>Projected {rank_label} Ranking: {format_rank(projected_rank)}</div>",
-            unsafe_allow_html=True,
+    caption_parts = []
+    if not pd.isna(projected_end_rank):
+        caption_parts.append(f"Projected end-of-season: {format_rank(projected_end_rank)}")
+    if not pd.isna(current_rank):
+        caption_parts.append(f"Current poll rank: {format_rank(current_rank)}")
+    if run_date is not None and not pd.isna(run_date):
+        run_label = pd.to_datetime(run_date).strftime("%b %-d, %Y")
+        run_source = f"{run_type} run" if run_type is not None and not pd.isna(run_type) else "latest run"
+        caption_parts.append(f"Projection from {run_label} {run_source}")
+    if model_version is not None and not pd.isna(model_version):
+        caption_parts.append(f"Model: {model_version}")
+    if not pd.isna(projection_week):
+        caption_parts.append(f"Projected poll week: {int(projection_week)}")
+    if caption_parts:
+        st.caption(" | ".join(caption_parts))
+
+    chart_parts = []
+    if not poll_history.empty:
+        actual_df = poll_history.rename(columns={"week": "Week", "ranking": "Ranking"})
+        actual_df["Type"] = "Actual"
+        chart_parts.append(actual_df[["Week", "Ranking", "Type"]])
+
+    if not pd.isna(projected_rank) and not pd.isna(projection_week):
+        projected_df = pd.DataFrame(
+            {
+                "Week": [int(projection_week)],
+                "Ranking": [float(projected_rank)],
+                "Type": ["Projected"],
+            }
         )
+        chart_parts.append(projected_df)
 
-        caption_parts = []
-        if not pd.isna(projected_end_rank):
-            caption_parts.append(f"Projected end-of-season: {format_rank(projected_end_rank)}")
-        if not pd.isna(current_rank):
-            caption_parts.append(f"Current poll rank: {format_rank(current_rank)}")
-        if run_date is not None and not pd.isna(run_date):
-            run_label = pd.to_datetime(run_date).strftime("%b %-d, %Y")
-            run_source = f"{run_type} run" if run_type is not None and not pd.isna(run_type) else "latest run"
-            caption_parts.append(f"Projection from {run_label} {run_source}")
-        if model_version is not None and not pd.isna(model_version):
-            caption_parts.append(f"Model: {model_version}")
-        if not pd.isna(projection_week):
-            caption_parts.append(f"Projected poll week: {int(projection_week)}")
-        if caption_parts:
-            st.caption(" | ".join(caption_parts))
-
-        chart_parts = []
-        if not poll_history.empty:
-            actual_df = poll_history.rename(columns={"week": "Week", "ranking": "Ranking"})
-            actual_df["Type"] = "Actual"
-            chart_parts.append(actual_df[["Week", "Ranking", "Type"]])
-
-        if not pd.isna(projected_rank) and not pd.isna(projection_week):
-            projected_df = pd.DataFrame(
-                {
-                    "Week": [int(projection_week)],
-                    "Ranking": [float(projected_rank)],
-                    "Type": ["Projected"],
-                }
-            )
-            chart_parts.append(projected_df)
-
-        if not chart_parts:
-            st.info(f"No current-season {rank_label} poll history or ranking projection found for {selected_team}.")
-        else:
-            chart_df = pd.concat(chart_parts, ignore_index=True)
-            y_max = max(25, int(np.ceil(chart_df["Ranking"].max())))
-            week_sort = sorted(chart_df["Week"].dropna().astype(int).unique().tolist())
-
-            ranking_chart = (
-                alt.Chart(chart_df)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "Week:O",
-                        title="Week",
-                        sort=week_sort,
-                    ),
-                    y=alt.Y(
-                        "Ranking:Q",
-                        title=f"{rank_label} Ranking",
-                        scale=alt.Scale(domain=[1, y_max], reverse=True),
-                        axis=alt.Axis(tickMinStep=1),
-                    ),
-                    color=alt.Color(
-                        "Type:N",
-                        scale=alt.Scale(
-                            domain=["Actual", "Projected"],
-                            range=[team_hex, "#111827"],
-                        ),
-                        legend=alt.Legend(title=None),
+    if not chart_parts:
+        st.info(f"No current-season {rank_label} poll history or ranking projection found for {team}.")
+    else:
+        chart_df = pd.concat(chart_parts, ignore_index=True)
+        y_max = max(25, int(np.ceil(chart_df["Ranking"].max())))
+        week_sort = sorted(chart_df["Week"].dropna().astype(int).unique().tolist())
+
+        ranking_chart = (
+            alt.Chart(chart_df)
+            .mark_line(point=True)
+            .encode(
+                x=alt.X(
+                    "Week:O",
+                    title="Week",
+                    sort=week_sort,
+                ),
+                y=alt.Y(
+                    "Ranking:Q",
+                    title=f"{rank_label} Ranking",
+                    scale=alt.Scale(domain=[1, y_max], reverse=True),
+                    axis=alt.Axis(tickMinStep=1),
+                ),
+                color=alt.Color(
+                    "Type:N",
+                    scale=alt.Scale(
+                        domain=["Actual", "Projected"],
+                        range=[team_color, "#111827"],
                     ),
-                    strokeDash=alt.StrokeDash(
-                        "Type:N",
-                        scale=alt.Scale(
-                            domain=["Actual", "Projected"],
-                            range=[[1, 0], [4, 4]],
-                        ),
-                        legend=None,
+                    legend=alt.Legend(title=None),
+                ),
+                strokeDash=alt.StrokeDash(
+                    "Type:N",
+                    scale=alt.Scale(
+                        domain=["Actual", "Projected"],
+                        range=[[1, 0], [4, 4]],
                     ),
-                    tooltip=[
-                        alt.Tooltip("Week:O", title="Week"),
-                        alt.Tooltip("Ranking:Q", title=f"{rank_label} Ranking", format=".0f"),
-                        alt.Tooltip("Type:N", title="Source"),
-                    ],
-                )
+                    legend=None,
+                ),
+                tooltip=[
+                    alt.Tooltip("Week:O", title="Week"),
+                    alt.Tooltip("Ranking:Q", title=f"{rank_label} Ranking", format=".0f"),
+                    alt.Tooltip("Type:N", title="Source"),
+                ],
             )
-            st.altair_chart(ranking_chart, use_container_width=True)
+        )
+        st.altair_chart(ranking_chart, use_container_width=True)
+
+
+@st.fragment
+def render_schedule_map(team: str, season: int) -> None:
+    """Fetched and built only once the map is switched on; the toggle reruns only this section."""
+    if not st.toggle("Show schedule map", key="show_schedule_map"):
+        return
+
+    schedule_map_df = get_schedule_map_data(team, season)
+    if schedule_map_df.empty:
+        st.info(f"No mapped schedule venues found for {team} in {season}.")
+    else:
+        components.html(
+            get_schedule_map_html(schedule_map_df, team, season),
+            height=490,
+            scrolling=False,
+        )
+
+
+# ----------------------------
+# Data for dropdown
+# ----------------------------
+current_season = get_current_season()
+teams = get_team_names()
+
+
+# ----------------------------
+# Header: dropdown + title
+# ----------------------------
+col1, col2, col3 = st.columns([1, 2, 1])
+with col2:
+    selected_team = st.selectbox("", options=teams, index=None, placeholder="Select a team")
+
+team_hex = get_team_hex(selected_team)
+team_label = selected_team or ""
+
+st.markdown(
+    f"""
+    <h1 style='text-align:left; margin-top:-1.5rem; margin-bottom:0.25rem;'>
+      Single Team Projections for: {team_label}
+    </h1>
+    """,
+    unsafe_allow_html=True,
+)
+
+
+# ----------------------------
+# Main content (only after team selected)
+# ----------------------------
+if selected_team:
+    now = pd.Timestamp.now(tz="UTC")
+
+    # Independent fetches run concurrently; latency is the slowest one.
+    fetched, fetch_timings = run_concurrently(
+        {
+            "team_games": lambda: get_team_games(selected_team, current_season),
+            "season_prediction": lambda: get_season_prediction(selected_team, current_season),
+            "ranking_projection": lambda: get_latest_ranking_projection(selected_team, current_season),
+            **{
+                f"poll_history_{key}": (lambda poll=option["poll"]: get_poll_ranking_history(selected_team, current_season, poll))
+                for key, option in RANKING_OPTIONS.items()
+            },
+        }
+    )
+    team_games = fetched["team_games"]
+    team_games["startdate"] = pd.to_datetime(team_games["startdate"], utc=True)
+
+    # Upcoming games (FBS opponents only; the win distribution uses the full schedule)
+    upcoming_games = fbs_games(team_games)
+    upcoming_games = upcoming_games[upcoming_games["startdate"] > now].sort_values("startdate")
+
+    render_season_outlook(
+        selected_team,
+        current_season,
+        team_games,
+        upcoming_games,
+        fetched["season_prediction"],
+        team_hex,
+    )
+
+    ranking_left, ranking_right = st.columns(2)
+
+    with ranking_left:
+        render_ranking_projection(
+            selected_team,
+            fetched["ranking_projection"],
+            {key: fetched[f"poll_history_{key}"] for key in RANKING_OPTIONS},
+            team_hex,
+        )
 
     with ranking_right:
-        if schedule_map_df.empty:
-            st.info(f"No mapped schedule venues found for {selected_team} in {current_season}.")
-        else:
-            components.html(
-                build_schedule_map(schedule_map_df, selected_team),
-                height=490,
-                scrolling=False,
-            )
+        render_schedule_map(selected_team, current_season)
+
+    render_fetch_timings(fetch_timings)
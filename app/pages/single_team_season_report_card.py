@@ -1,97 +1,26 @@
 import streamlit as st
 import pandas as pd
-from utils.db import read_df
+import numpy as np
+from utils.db import read_arrow_df, read_df
+from utils.grades import (
+    DEFENSE_GRADE_CATALOG,
+    OFFENSE_GRADE_CATALOG,
+    season_grade_from_percentile as grade_from_percentile,
+)
+from utils.grade_table import get_season_grades
+from utils.percentiles import build_percentile_index, percentile_from_index
+from utils.teams import get_team_hex, get_team_names
 
 # ============================
 # STYLING
 # ============================
 
 def _apply_styles() -> None:
-    """Apply all custom CSS for report cards."""
+    """Page-specific layout tweaks; card styles live in styles/report_card.css."""
     st.markdown(
         """
         <style>
           div[data-testid="stSelectbox"] { margin-top: -1rem; }
-          .rc-card {
-            border: 1px solid rgba(49, 51, 63, 0.2);
-            border-radius: 10px;
-            padding: 0.65rem 0.75rem;
-            margin: 0.35rem 0 0.65rem 0;
-            background: rgba(255, 255, 255, 0.02);
-          }
-          .rc-card .rc-head {
-            display: flex;
-            align-items: baseline;
-            justify-content: space-between;
-            margin-bottom: 0.4rem;
-          }
-          .rc-card .rc-title {
-            font-weight: 800;
-            font-size: 1.22rem;
-            letter-spacing: 0.2px;
-            margin: 0;
-          }
-          .rc-grid {
-            display: grid;
-            grid-template-columns: 88px 1fr;
-            gap: 0.35rem 0.6rem;
-            align-items: center;
-          }
-          .rc-grid > div:nth-child(1),
-          .rc-grid > div:nth-child(2) {
-            align-self: end;
-          }
-          .rc-grid > div {
-            padding-bottom: 0.2rem;
-          }
-          .rc-grid > div:not(:nth-last-child(-n+2)) {
-            border-bottom: 1px dashed rgba(49, 51, 63, 0.25);
-          }
-          .rc-pos {
-            font-weight: 700;
-            font-size: 0.92rem;
-          }
-          .rc-pos-wrap {
-            display: flex;
-            flex-direction: column;
-            align-items: flex-start;
-            gap: 0.25rem;
-          }
-          .rc-pos-overall {
-            font-size: 0.78rem;
-            padding: 0.06rem 0.45rem;
-          }
-          .rc-pills {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.35rem;
-            justify-content: center;
-          }
-          .rc-pill {
-            border: 1px solid rgba(49, 51, 63, 0.18);
-            border-radius: 999px;
-            padding: 0.08rem 0.5rem;
-            font-size: 0.82rem;
-            line-height: 1.35;
-            opacity: 0.95;
-            white-space: nowrap;
-          }
-          .rc-pill-grade {
-            border-radius: 999px;
-            padding: 0.08rem 0.55rem;
-            font-size: 0.82rem;
-            line-height: 1.35;
-            font-weight: 800;
-            white-space: nowrap;
-          }
-          .rc-head-grade {
-            border-radius: 999px;
-            padding: 0.14rem 0.6rem;
-            font-size: 1.02rem;
-            font-weight: 900;
-            line-height: 1;
-            display: inline-block;
-          }
         </style>
         """,
         unsafe_allow_html=True
@@ -104,37 +33,6 @@ _apply_styles()
 # DATABASE HELPERS
 # ============================
 
-def get_team_hex(team: str | None) -> str:
-    """Get hex color for a team from team_map."""
-    if not team:
-        return "#4C78A8"
-    df = read_df(
-        """
-        WITH team_ids AS (
-            SELECT homeid::text AS team_id
-            FROM public.game_data
-            WHERE hometeam = :team
-              AND homeid IS NOT NULL
-
-            UNION
-
-            SELECT awayid::text AS team_id
-            FROM public.game_data
-            WHERE awayteam = :team
-              AND awayid IS NOT NULL
-        )
-        SELECT tm."Color"
-        FROM public.team_map tm
-        JOIN team_ids ti
-          ON tm."Id"::text = ti.team_id
-        WHERE tm."Color" IS NOT NULL
-        LIMIT 1
-        """,
-        params={"team": team},
-    )
-    return df["Color"].iloc[0] if not df.empty else "#4C78A8"
-
-
 def get_team_seasons(team: str | None) -> list[int]:
     """Return available seasons for a team (most recent first)."""
     if not team:
@@ -185,62 +83,25 @@ def get_team_stats(team: str | None, season: int | None = None) -> pd.DataFrame:
 # GRADING & PERCENTILE HELPERS
 # ============================
 
-def grade_from_percentile(pct: float) -> tuple[str, str, str]:
-    """Return (letter, bg_hex, fg_hex) from a 0-100 percentile.
-    
-    Grade bands: A+/A/A- (94+), B+/B/B- (74+), C+/C/C- (54+), D+/D/D- (34+), F.
-    """
-    pct = float(max(0.0, min(100.0, pct)))
-
-    if pct >= 94:
-        return ("A+", "#0B3D1A", "#FFFFFF")
-    if pct >= 86:
-        return ("A", "#145A32", "#FFFFFF")
-    if pct >= 80:
-        return ("A-", "#1E7D3A", "#FFFFFF")
-    if pct >= 74:
-        return ("B+", "#2ECC71", "#0B2E13")
-    if pct >= 66:
-        return ("B", "#58D68D", "#0B2E13")
-    if pct >= 60:
-        return ("B-", "#82E0AA", "#0B2E13")
-    if pct >= 54:
-        return ("C+", "#F7DC6F", "#4D3B00")
-    if pct >= 46:
-        return ("C", "#F4D03F", "#4D3B00")
-    if pct >= 40:
-        return ("C-", "#F9E79F", "#4D3B00")
-    if pct >= 34:
-        return ("D+", "#F8C471", "#5A2E00")
-    if pct >= 26:
-        return ("D", "#F5B041", "#5A2E00")
-    if pct >= 20:
-        return ("D-", "#F0B27A", "#5A2E00")
-    return ("F", "#E74C3C", "#FFFFFF")
-
-
-def league_percentile_for_stat(season: int, stat_col: str, value: float, higher_is_better: bool = True) -> float:
-    """Compute league percentile (0-100) for a value vs all FBS teams in that season."""
-    df = read_df(
+@st.cache_resource(ttl=300)
+def get_season_percentile_index(season: int) -> dict[str, np.ndarray]:
+    """Sorted league values per graded stat for one season (one wide fetch)."""
+    cols = [col for _, col, _ in OFFENSE_GRADE_CATALOG + DEFENSE_GRADE_CATALOG]
+    df = read_arrow_df(
         f"""
-        SELECT {stat_col} AS v
+        SELECT {", ".join(cols)}
         FROM public.team_advanced_season_stats
         WHERE season = :season
-          AND {stat_col} IS NOT NULL
         """,
         params={"season": int(season)},
     )
-    if df.empty:
-        return 50.0
+    return build_percentile_index(df, cols)
 
-    s = df["v"].astype(float)
-    if not higher_is_better:
-        s = -s
-        value = -float(value)
 
-    s2 = pd.concat([s, pd.Series([float(value)])], ignore_index=True)
-    pct = float(s2.rank(pct=True).iloc[-1]) * 100.0
-    return pct
+def league_percentile_for_stat(season: int, stat_col: str, value: float, higher_is_better: bool = True) -> float:
+    """Compute league percentile (0-100) for a value vs all FBS teams in that season."""
+    index = get_season_percentile_index(int(season))
+    return percentile_from_index(index, stat_col, float(value), higher_is_better=higher_is_better)
 
 
 def _grade_from_stats(stats: pd.DataFrame, season: int, col: str, higher_is_better: bool = True) -> tuple[str, str, str] | None:
@@ -428,43 +289,43 @@ def render_defense_card(
 # GRADE COMPUTATION
 # ============================
 
-def compute_offense_grades(stats: pd.DataFrame, season: int) -> dict[str, tuple[str, str, str] | None]:
-    """Compute all offense grades for the report card from one team-season row."""
-    return {
-        "offense_overall": _grade_from_stats(stats, season, "offense_ppa", higher_is_better=True),
+def _grades_from_catalog(
+    stats: pd.DataFrame,
+    season: int,
+    catalog: list[tuple[str, str, bool]],
+    materialized: dict[str, float] | None = None,
+) -> dict[str, tuple[str, str, str] | None]:
+    """Grade every (key, column, higher_is_better) entry of a catalog.
 
-        "passing_overall": _grade_from_stats(stats, season, "offense_passingplays_ppa", higher_is_better=True),
-        "passing_efficiency": _grade_from_stats(stats, season, "offense_passingplays_successrate", higher_is_better=True),
-        "passing_explosiveness": _grade_from_stats(stats, season, "offense_passingplays_explosiveness", higher_is_better=True),
+    Keys found in the materialized grades table skip the live percentile lookup.
+    """
+    materialized = materialized or {}
+    return {
+        key: (
+            grade_from_percentile(materialized[key])
+            if key in materialized
+            else _grade_from_stats(stats, season, col, higher_is_better=higher_is_better)
+        )
+        for key, col, higher_is_better in catalog
+    }
 
-        "rushing_overall": _grade_from_stats(stats, season, "offense_rushingplays_ppa", higher_is_better=True),
-        "rushing_efficiency": _grade_from_stats(stats, season, "offense_rushingplays_successrate", higher_is_better=True),
-        "rushing_explosiveness": _grade_from_stats(stats, season, "offense_rushingplays_explosiveness", higher_is_better=True),
-        "rushing_power": _grade_from_stats(stats, season, "offense_powersuccess", higher_is_better=True),
 
-        "ol_pass_protection": _grade_from_stats(stats, season, "offense_havoc_frontseven", higher_is_better=False),
-        "ol_run_blocking": _grade_from_stats(stats, season, "offense_lineyards", higher_is_better=True),
-    }
+def compute_offense_grades(
+    stats: pd.DataFrame,
+    season: int,
+    materialized: dict[str, float] | None = None,
+) -> dict[str, tuple[str, str, str] | None]:
+    """Compute all offense grades for the report card from one team-season row."""
+    return _grades_from_catalog(stats, season, OFFENSE_GRADE_CATALOG, materialized)
 
 
-def compute_defense_grades(stats: pd.DataFrame, season: int) -> dict[str, tuple[str, str, str] | None]:
+def compute_defense_grades(
+    stats: pd.DataFrame,
+    season: int,
+    materialized: dict[str, float] | None = None,
+) -> dict[str, tuple[str, str, str] | None]:
     """Compute all defense grades for the report card from one team-season row."""
-    return {
-        # Overall defense: lower is better
-        "defense_overall": _grade_from_stats(stats, season, "defense_ppa", higher_is_better=False),
-
-        # Passing
-        "pass_overall": _grade_from_stats(stats, season, "defense_passingplays_ppa", higher_is_better=False),
-        "pass_efficiency": _grade_from_stats(stats, season, "defense_passingplays_successrate", higher_is_better=False),
-        "pass_db_havoc": _grade_from_stats(stats, season, "defense_havoc_db", higher_is_better=True),
-        "pass_explosiveness_allowed": _grade_from_stats(stats, season, "defense_passingplays_explosiveness", higher_is_better=False),
-
-        # Run Stop
-        "run_overall": _grade_from_stats(stats, season, "defense_rushingplays_ppa", higher_is_better=False),
-        "run_efficiency": _grade_from_stats(stats, season, "defense_rushingplays_successrate", higher_is_better=False),
-        "run_stuff_rate": _grade_from_stats(stats, season, "defense_stuffrate", higher_is_better=True),
-        "run_explosiveness_allowed": _grade_from_stats(stats, season, "defense_rushingplays_explosiveness", higher_is_better=False),
-    }
+    return _grades_from_catalog(stats, season, DEFENSE_GRADE_CATALOG, materialized)
 
 
 # ============================
@@ -479,13 +340,15 @@ def render_side_panel(team: str | None, season: int | None, label: str, team_hex
         st.info("Select a team and season.")
         return
 
-    stats = get_team_stats(team, season)
-    if stats.empty:
+    # Prefer the batch-built grades table; only grade live when it has no rows.
+    materialized = get_season_grades(team, season)
+    stats = pd.DataFrame() if materialized else get_team_stats(team, season)
+    if not materialized and stats.empty:
         st.info("No data for that team/season.")
         return
 
-    off_grades = compute_offense_grades(stats, int(season))
-    def_grades = compute_defense_grades(stats, int(season))
+    off_grades = compute_offense_grades(stats, int(season), materialized)
+    def_grades = compute_defense_grades(stats, int(season), materialized)
 
     render_offense_card(
         team_hex,
@@ -520,16 +383,7 @@ def render_side_panel(team: str | None, season: int | None, label: str, team_hex
 # ============================
 
 # Load team options
-game_data = read_df(
-    """
-    SELECT *
-    FROM public.game_data
-    WHERE startdate IS NOT NULL
-      AND homeclassification = 'fbs'
-      AND awayclassification = 'fbs'
-    """
-)
-teams = sorted(pd.concat([game_data["hometeam"], game_data["awayteam"]]).dropna().unique())
+teams = get_team_names()
 
 # Header with side-by-side selectors
 left_col, right_col = st.columns(2, gap="large")
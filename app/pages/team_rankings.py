@@ -1,6 +1,9 @@
+import html as html_lib
 import streamlit as st
 import pandas as pd
 from utils.db import read_df
+from utils.logos import logo_src
+from utils.teams import get_logo_by_cfb_name, get_watermark
 
 st.title("Team Rankings", )
 
@@ -20,88 +23,120 @@ personal_df = pd.DataFrame(PERSONAL_TOP25, columns=["rank", "team"]).sort_values
 # Helpers
 # =============================
 
-@st.cache_data(ttl=300)
-def get_team_map() -> pd.DataFrame:
-    """
-    team_map columns:
-      - cfb_name  (canonical team name)
-      - Logo      (image URL)
-    """
-    return read_df("""
-        SELECT
-            cfb_name,
-            "Logo"
-        FROM team_map
-    """)
-
 def attach_logo(df: pd.DataFrame, team_col: str) -> pd.DataFrame:
     """
-    Joins any dataframe to team_map using cfb_name.
+    Looks up each team's Logo by team_map.cfb_name from the shared in-memory map,
+    served from the local logo store when it has a copy.
     """
-    team_map = get_team_map()
-
-    out = df.merge(
-        team_map,
-        left_on=team_col,
-        right_on="cfb_name",
-        how="left"
-    )
-
+    out = df.copy()
+    out["Logo"] = out[team_col].map(get_logo_by_cfb_name()).map(logo_src)
     out["display_team"] = out[team_col]
     return out
 
-def render_top25_grid(df: pd.DataFrame, title: str):
+GRID_COLUMNS = ["rank", "display_team", "Logo"]
+
+@st.cache_data(ttl=3600, max_entries=256)
+def build_top25_grid_html(_df: pd.DataFrame, grid_key: tuple) -> str:
     """
-    Renders a 5x5 grid for Top 25 teams.
+    One HTML block for a 5x5 Top 25 grid, memoized on grid_key; _df is not
+    hashed, so grid_key must identify its content (see render_top25_grid).
     Requires columns: rank, display_team, Logo
     """
+    by_rank: dict[int, dict] = {}
+    for row in _df.to_dict("records"):
+        rank = int(row["rank"])
+        if 1 <= rank <= 25:
+            by_rank.setdefault(rank, row)
+
+    cells = []
+    for rank in range(1, 26):
+        item = by_rank.get(rank, {})
+        logo = item.get("Logo")
+        logo_html = (
+            f'<img src="{html_lib.escape(logo)}" width="48" height="48" style="object-fit:contain;" alt="">'
+            if isinstance(logo, str)
+            else '<div style="height:48px;"></div>'
+        )
+        # Kept on one line: blank lines inside markdown HTML end the block.
+        cells.append(
+            '<div style="border:1px solid rgba(255,255,255,0.12); border-radius:12px; '
+            'padding:10px; min-height:96px; text-align:center;">'
+            f'<div style="font-size:12px; opacity:0.7;">#{rank}</div>'
+            f"{logo_html}"
+            f'<div style="font-weight:600; line-height:1.1;">{html_lib.escape(str(item.get("display_team") or ""))}</div>'
+            "</div>"
+        )
+
+    return (
+        '<div style="display:grid; grid-template-columns:repeat(5, minmax(0, 1fr)); gap:0.5rem;">'
+        + "".join(cells)
+        + "</div>"
+    )
+
+def render_top25_grid(df: pd.DataFrame, title: str, grid_key: tuple):
+    """
+    Renders a 5x5 grid for Top 25 teams as a single element.
+    A fingerprint of the rendered columns is added to grid_key, so refreshed
+    rankings or logos never hit HTML built from older data.
+    """
+    fingerprint = int(pd.util.hash_pandas_object(df[GRID_COLUMNS], index=False).sum())
     st.subheader(title)
+    st.markdown(build_top25_grid_html(df, (*grid_key, fingerprint)), unsafe_allow_html=True)
+
+@st.cache_resource(max_entries=1)
+def _build_rankings_cube(rankings_watermark: str, ratings_watermark: str) -> dict:
+    """
+    All of rankings and team_ratings, loaded once and indexed by dropdown key:
+    polls by (poll, season, week), ratings by (model, asof_date), ranks precomputed.
+    Rebuilt only when either table's watermark moves.
+    Slices are shared across sessions, so treat them as read-only.
+    """
+    polls = read_df("""
+        SELECT poll, season, week, rank, school AS team
+        FROM rankings
+    """)
+    ratings = read_df("""
+        SELECT rating_model, asof_date, team, rating_value
+        FROM team_ratings
+        WHERE rating_value IS NOT NULL
+    """)
+
+    ratings["rank"] = ratings.groupby(["rating_model", "asof_date"])["rating_value"].rank(
+        method="first", ascending=False
+    ).astype(int)
+
+    polls = polls.sort_values(["poll", "season", "week", "rank"])
+    ratings = ratings.sort_values(["rating_model", "asof_date", "rank"])
+
+    return {
+        "seasons": sorted(polls["season"].dropna().unique().tolist(), reverse=True),
+        "weeks": {
+            key: sorted(group.unique().tolist())
+            for key, group in polls.groupby(["poll", "season"])["week"]
+        },
+        "polls": {
+            key: group[["rank", "team"]].reset_index(drop=True)
+            for key, group in polls.groupby(["poll", "season", "week"])
+        },
+        "models": sorted(ratings["rating_model"].unique().tolist()),
+        "asof_dates": {
+            model: sorted(group.unique().tolist())
+            for model, group in ratings.groupby("rating_model")["asof_date"]
+        },
+        "ratings": {
+            key: group[["team", "rating_value", "rank"]].reset_index(drop=True)
+            for key, group in ratings.groupby(["rating_model", "asof_date"])
+        },
+    }
 
-    df = df.sort_values("rank").head(25).copy()
-
-    slots = []
-    for r in range(1, 26):
-        if (df["rank"] == r).any():
-            slots.append(df.loc[df["rank"] == r].iloc[0])
-        else:
-            slots.append(pd.Series({"rank": r, "display_team": "", "Logo": None}))
-
-    for i in range(0, 25, 5):
-        cols = st.columns(5, gap="small")
-        for j in range(5):
-            item = slots[i + j]
-            with cols[j]:
-                st.markdown(
-                    f"""
-                    <div style="
-                        border:1px solid rgba(255,255,255,0.12);
-                        border-radius:12px;
-                        padding:10px;
-                        min-height:96px;
-                        text-align:center;
-                    ">
-                        <div style="font-size:12px; opacity:0.7;">#{int(item['rank'])}</div>
-                    """,
-                    unsafe_allow_html=True,
-                )
-
-                if isinstance(item.get("Logo"), str):
-                    st.image(item["Logo"], width=48)
-
-                st.markdown(
-                    f"<div style='font-weight:600; line-height:1.1;'>{item['display_team']}</div></div>",
-                    unsafe_allow_html=True,
-                )
+def get_rankings_cube() -> dict:
+    return _build_rankings_cube(get_watermark("rankings"), get_watermark("team_ratings"))
 
 # =============================
 # Dropdown values
 # =============================
-rankings_years_df = read_df("""
-    SELECT DISTINCT season AS year
-    FROM rankings
-    ORDER BY year DESC
-""")
-rankings_years = rankings_years_df["year"].tolist()
+cube = get_rankings_cube()
+rankings_years = cube["seasons"]
 
 POLL_TYPE_MAP = {
     "CFP Rankings": "Playoff Committee Rankings",
@@ -109,11 +144,7 @@ POLL_TYPE_MAP = {
     "FBS Coaches Poll": "Coaches Poll",
 }
 
-rating_models = read_df("""
-    SELECT DISTINCT rating_model
-    FROM team_ratings
-    ORDER BY rating_model
-""")["rating_model"].tolist()
+rating_models = cube["models"]
 
 # =============================
 # Layout
@@ -128,25 +159,15 @@ with topA:
     poll = POLL_TYPE_MAP[poll_ui]
     year = st.selectbox("Year", rankings_years)
 
-    weeks = read_df("""
-        SELECT DISTINCT week
-        FROM rankings
-        WHERE poll = :poll AND season = :year
-        ORDER BY week
-    """, {"poll": poll, "year": year})["week"].tolist()
+    weeks = cube["weeks"].get((poll, year), [])
 
     week = st.selectbox("Week", weeks, index=len(weeks) - 1)
 
-    prof_df = read_df("""
-        SELECT rank, school AS team
-        FROM rankings
-        WHERE poll = :poll AND season = :year AND week = :week
-        ORDER BY rank
-    """, {"poll": poll, "year": year, "week": week})
+    prof_df = cube["polls"].get((poll, year, week), pd.DataFrame(columns=["rank", "team"]))
 
     prof_df = attach_logo(prof_df, "team")
 
-    render_top25_grid(prof_df, "Professional Polls")
+    render_top25_grid(prof_df, "Professional Polls", (poll, year, week))
 
 # -------------------------------------------------
 # TOP RIGHT — Personal Rankings (Grid)
@@ -154,7 +175,7 @@ with topA:
 with topB:
     pers_df = attach_logo(personal_df, "team")
 
-    render_top25_grid(pers_df, "@BG.Analytics Personal Rankings")
+    render_top25_grid(pers_df, "@BG.Analytics Personal Rankings", ("personal", tuple(PERSONAL_TOP25)))
 
 # -------------------------------------------------
 # BOTTOM — Statistical Ratings (List)
@@ -167,26 +188,12 @@ with center:
 
     model = st.selectbox("Rating Model", rating_models)
 
-    asof_dates = read_df("""
-        SELECT DISTINCT asof_date
-        FROM team_ratings
-        WHERE rating_model = :model
-        ORDER BY asof_date
-    """, {"model": model})["asof_date"].tolist()
+    asof_dates = cube["asof_dates"].get(model, [])
 
     asof = st.selectbox("As-of Date", asof_dates, index=len(asof_dates) - 1)
 
-    stat_raw = read_df("""
-        SELECT team, rating_value
-        FROM team_ratings
-        WHERE rating_model = :model AND asof_date = :asof
-    """, {"model": model, "asof": asof})
-
-    stat_raw["rank"] = stat_raw["rating_value"].rank(
-        method="first", ascending=False
-    ).astype(int)
-
-    stat_df = stat_raw.sort_values("rank")
+    # Already sorted by the precomputed rank
+    stat_df = cube["ratings"].get((model, asof), pd.DataFrame(columns=["team", "rating_value", "rank"]))
     stat_df = attach_logo(stat_df, "team")
 
     st.data_editor(
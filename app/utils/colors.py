@@ -0,0 +1,46 @@
+"""Vectorized color scales for probability and percentile columns.
+
+Colors are computed for a whole column in one NumPy pass, so styling a table
+costs one call per column rather than one Python call per cell:
+
+    df.style.apply(probability_css, subset=["Win Probability"])
+    df.style.apply(probability_css, scale=100, subset=["Percentile"])
+"""
+import numpy as np
+import pandas as pd
+
+# Red -> yellow -> green across 0-1.
+SCALE_STOPS = np.array([0.0, 0.5, 1.0])
+SCALE_RGB = np.array(
+    [
+        [220, 38, 38],
+        [250, 204, 21],
+        [22, 163, 74],
+    ]
+)
+DARK_TEXT = "#111827"
+LIGHT_TEXT = "#ffffff"
+MISSING_CSS = "background-color: #d1d5db; color: #374151;"
+
+
+def _as_unit(values, scale: float) -> np.ndarray:
+    numeric = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    return np.clip(numeric / scale, 0.0, 1.0)
+
+
+def probability_rgb(values, scale: float = 1.0) -> np.ndarray:
+    """(n, 3) RGB on the red-yellow-green scale; missing values come back as NaN rows."""
+    unit = _as_unit(values, scale)
+    rgb = np.column_stack([np.interp(unit, SCALE_STOPS, SCALE_RGB[:, channel]) for channel in range(3)])
+    return np.floor(rgb)
+
+
+def probability_css(values, scale: float = 1.0) -> np.ndarray:
+    """Per-cell "background-color; color" CSS for a column (for Styler.apply, axis=0)."""
+    unit = _as_unit(values, scale)
+    rgb = pd.DataFrame(probability_rgb(unit)).fillna(0).astype(int).astype(str)
+    text = np.where((unit >= 0.25) & (unit <= 0.75), DARK_TEXT, LIGHT_TEXT)
+    css = (
+        "background-color: rgb(" + rgb[0] + ", " + rgb[1] + ", " + rgb[2] + "); color: " + text + ";"
+    ).to_numpy(dtype=object)
+    return np.where(np.isnan(unit), MISSING_CSS, css)
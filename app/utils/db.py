@@ -1,20 +1,35 @@
+import logging
 import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from utils.query_cache import WATERMARK_POLL_SECONDS, WATERMARKS, QueryCache, query_ttl, query_watermarks
 
-def _get_db_url() -> str:
+logger = logging.getLogger(__name__)
+
+def get_setting(name: str) -> str | None:
+    """A setting from Streamlit secrets, falling back to the environment."""
     # 1) Streamlit Cloud (or local if secrets.toml exists)
     try:
-        db_url = st.secrets.get("NEON_DATABASE_URL", None)
-        if db_url:
-            return db_url
+        value = st.secrets.get(name, None)
+        if value:
+            return value
     except Exception:
         # No secrets.toml locally (common in Codespaces)
         pass
 
     # 2) Local dev / Codespaces: use env var
-    db_url = os.getenv("NEON_DATABASE_URL")
+    return os.getenv(name) or None
+
+
+def _get_db_url() -> str:
+    db_url = get_setting("NEON_DATABASE_URL")
     if db_url:
         return db_url
 
@@ -22,14 +37,256 @@ def _get_db_url() -> str:
         "Missing NEON_DATABASE_URL. Set it in Streamlit secrets (cloud) or as an environment variable."
     )
 
+
+def get_mirror_path() -> Path | None:
+    """Local DuckDB mirror file, when LOCAL_MIRROR_PATH is set and the mirror has been synced."""
+    mirror_path = get_setting("LOCAL_MIRROR_PATH")
+    if not mirror_path:
+        return None
+    path = Path(mirror_path).expanduser()
+    return path if path.exists() else None
+
+
 @st.cache_resource
-def get_engine():
+def get_source_engine():
+    """Engine for the Neon Postgres database (writes and mirror syncs always go here)."""
     db_url = _get_db_url()
     # pool_pre_ping helps handle dropped connections gracefully
     return create_engine(db_url, pool_pre_ping=True)
 
-@st.cache_data(ttl=300)
-def read_df(sql: str, params: dict | None = None) -> pd.DataFrame:
+
+def get_engine():
+    """Engine used for reads: the local mirror when enabled and synced, otherwise Neon.
+
+    The mirror file is checked on every call, so a mirror synced after startup
+    is picked up without restarting the app (and a removed one falls back to Neon).
+    """
+    mirror_path = get_mirror_path()
+    if mirror_path is None:
+        return get_source_engine()
+    return _get_mirror_engine(str(mirror_path))
+
+
+@st.cache_resource
+def _get_mirror_engine(mirror_path: str):
+    try:
+        import duckdb_engine  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "LOCAL_MIRROR_PATH is set but duckdb / duckdb-engine are not installed."
+        ) from exc
+
+    # NullPool: every read opens the current file, so a freshly synced mirror is picked up immediately.
+    return create_engine(
+        f"duckdb:///{mirror_path}",
+        connect_args={"read_only": True},
+        poolclass=NullPool,
+    )
+
+@st.cache_resource
+def get_query_cache() -> QueryCache:
+    cache = QueryCache()
+    threading.Thread(
+        target=_watch_watermarks,
+        args=(cache,),
+        name="watermark-watch",
+        daemon=True,
+    ).start()
+    return cache
+
+
+def _watch_watermarks(cache: QueryCache) -> None:
+    """Poll the cheap WATERMARKS queries and invalidate dependent results when one moves."""
+    marks: dict[str, str] = {}
+    failing: set[str] = set()
+    while True:
+        for name, sql in WATERMARKS.items():
+            try:
+                mark = repr(_fetch_df(sql, None).iloc[0].tolist())
+            except Exception as exc:
+                # Optional tables may not exist yet; warn once, not every poll.
+                if name not in failing:
+                    logger.warning("Watermark %s check failed: %s", name, exc)
+                failing.add(name)
+                # Without a mark, changes can't be seen: fall back to refreshing
+                # dependents every poll rather than trusting the 24h safety TTL.
+                marks.pop(name, None)
+                cache.invalidate_tag(name)
+                continue
+            failing.discard(name)
+            if name in marks and marks[name] != mark:
+                dropped = cache.invalidate_tag(name)
+                logger.info("Watermark %s moved; invalidated %d cached queries", name, dropped)
+            marks[name] = mark
+        time.sleep(WATERMARK_POLL_SECONDS)
+
+
+def is_missing_table_error(exc: BaseException) -> bool:
+    """True when a query failed only because a table doesn't exist (Neon or the DuckDB mirror)."""
+    from psycopg.errors import UndefinedTable
+
+    # pandas and SQLAlchemy wrap the driver error; walk down to it.
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, UndefinedTable):
+            return True
+        if type(exc).__name__ == "CatalogException" and "Table with name" in str(exc):
+            return True
+        exc = getattr(exc, "orig", None) or exc.__cause__
+    return False
+
+
+def _cache_key(kind: str, sql: str, params: dict | None) -> tuple:
+    return (kind, sql, repr(sorted((params or {}).items())))
+
+
+def _fetch_df(sql: str, params: dict | None) -> pd.DataFrame:
     engine = get_engine()
     with engine.connect() as conn:
-        return pd.read_sql(text(sql), conn, params=params)
\ No newline at end of file
+        return pd.read_sql(text(sql), conn, params=params)
+
+
+def read_df(sql: str, params: dict | None = None) -> pd.DataFrame:
+    """Cached query; stale results are served while a background refresh runs (see utils.query_cache)."""
+    df = get_query_cache().get(
+        _cache_key("df", sql, params),
+        lambda: _fetch_df(sql, params),
+        ttl=query_ttl(sql),
+        tags=query_watermarks(sql),
+    )
+    # Callers mutate their frames, so never hand out the cached object.
+    return df.copy()
+
+# ----------------------------
+# Arrow-native reads
+# ----------------------------
+ARROW_BATCH_ROWS = 50_000
+
+# Low-cardinality string columns returned as pandas categoricals.
+CATEGORICAL_COLUMNS = frozenset({
+    "team",
+    "school",
+    "hometeam",
+    "awayteam",
+    "opponent",
+    "conference",
+    "homeconference",
+    "awayconference",
+    "classification",
+    "homeclassification",
+    "awayclassification",
+    "poll",
+    "rating_model",
+})
+
+
+def _compile(conn, sql: str, params: dict | None, dialect=None):
+    """Render :name placeholders into the driver's own paramstyle."""
+    compiled = text(sql).compile(dialect=dialect or conn.dialect)
+    params = params or {}
+    if compiled.positiontup:
+        return str(compiled), [params[name] for name in compiled.positiontup]
+    return str(compiled), params
+
+
+def _adbc_uri(conn) -> str:
+    """libpq URI for the connection's database (ADBC ignores the SQLAlchemy driver suffix)."""
+    return conn.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _normalize_arrow_types(table: pa.Table) -> pa.Table:
+    """Same column types from either backend.
+
+    NUMERIC arrives as decimal128 from DuckDB and as numeric text from ADBC;
+    both become float64, which is all the dashboards need. Other Postgres types
+    ADBC can't map come through as their text form.
+    """
+    for i, field in enumerate(table.schema):
+        column = table.column(i)
+        if isinstance(field.type, pa.BaseExtensionType):
+            column = pa.chunked_array([chunk.storage for chunk in column.chunks], type=field.type.storage_type)
+            if getattr(field.type, "type_name", None) == "numeric":
+                column = column.cast(pa.float64())
+        elif pa.types.is_decimal(field.type):
+            column = column.cast(pa.float64())
+        else:
+            continue
+        table = table.set_column(i, field.name, column)
+    return table
+
+
+def iter_arrow_batches(conn, sql: str, params: dict | None = None, batch_rows: int = ARROW_BATCH_ROWS) -> Iterator[pa.Table]:
+    """Stream a query as Arrow tables of at most `batch_rows` rows.
+
+    DuckDB (local mirror) hands back Arrow natively. On Postgres the query runs
+    through the ADBC driver, which reads COPY BINARY output straight into Arrow
+    columns in C, so no Python objects are built per row or per value. Peak
+    memory is one batch, not the result.
+    """
+    if conn.dialect.name == "duckdb":
+        query, bound = _compile(conn, sql, params)
+        reader = conn.connection.driver_connection.execute(query, bound).fetch_record_batch(batch_rows)
+        yield from _iter_reader(reader, batch_rows)
+        return
+
+    try:
+        import adbc_driver_postgresql.dbapi as adbc
+    except ImportError as exc:
+        raise RuntimeError(
+            "Arrow reads from Postgres need adbc-driver-postgresql (see requirements.txt)."
+        ) from exc
+
+    # ADBC binds positional $n parameters.
+    query, bound = _compile(conn, sql, params, dialect=conn.dialect.__class__(paramstyle="numeric_dollar"))
+    with adbc.connect(_adbc_uri(conn)) as adbc_conn, adbc_conn.cursor() as cur:
+        cur.execute(query, parameters=tuple(bound) or None)
+        yield from _iter_reader(cur.fetch_record_batch(), batch_rows)
+
+
+def _iter_reader(reader: pa.RecordBatchReader, batch_rows: int) -> Iterator[pa.Table]:
+    empty = True
+    for batch in reader:
+        # Driver batches are sized in bytes, not rows; slicing is zero-copy.
+        for offset in range(0, batch.num_rows, batch_rows):
+            empty = False
+            yield _normalize_arrow_types(pa.Table.from_batches([batch.slice(offset, batch_rows)]))
+    if empty:
+        # Keep the schema for empty results.
+        yield _normalize_arrow_types(reader.schema.empty_table())
+
+
+def arrow_to_pandas(table: pa.Table, categorical: frozenset[str] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """Arrow-backed pandas columns, with the listed string columns as categoricals."""
+    for i, field in enumerate(table.schema):
+        if field.name in categorical and pa.types.is_string(field.type):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    # Dictionary columns become pandas categoricals; everything else stays Arrow-backed.
+    return table.to_pandas(
+        types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t)
+    )
+
+
+def read_arrow(sql: str, params: dict | None = None, engine=None) -> pa.Table:
+    """Run a query and return one Arrow table (uncached)."""
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        batches = list(iter_arrow_batches(conn, sql, params))
+    if not batches:
+        return pa.table({})
+    return pa.concat_tables(batches, promote_options="permissive")
+
+
+def read_arrow_df(sql: str, params: dict | None = None) -> pd.DataFrame:
+    """Like read_df, but Arrow-native: typed Arrow-backed columns and categorical team/conference strings.
+
+    Use it for wide or large results; results behave like any DataFrame but
+    numeric columns are nullable Arrow types.
+    """
+    df = get_query_cache().get(
+        _cache_key("arrow", sql, params),
+        lambda: arrow_to_pandas(read_arrow(sql, params)),
+        ttl=query_ttl(sql),
+        tags=query_watermarks(sql),
+    )
+    return df.copy()
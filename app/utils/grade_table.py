@@ -0,0 +1,312 @@
+"""Materialized report card grades.
+
+Batch job (run from the app/ directory):
+
+    python -m utils.grade_table            # regrade seasons whose source rows changed, drop vanished ones
+    python -m utils.grade_table --full     # regrade every season
+
+Percentiles match the live report card math (utils.percentiles) and letters
+use the same bands (utils.grades), so pages can read a graded row instead of
+recomputing it from the raw team_advanced_* tables.
+"""
+import argparse
+import logging
+
+import pandas as pd
+from sqlalchemy import text
+
+from utils.db import get_source_engine, is_missing_table_error, read_df
+from utils.grades import (
+    DEFENSE_GRADE_CATALOG,
+    GAME_HEADLINE_STATS,
+    GAME_STAT_CATALOG,
+    OFFENSE_GRADE_CATALOG,
+    game_grade_from_percentile,
+    season_grade_from_percentile,
+)
+from utils.percentiles import build_percentile_index, percentile_ranks
+
+SEASON_GRADES_TABLE = "team_season_grades"
+GAME_GRADES_TABLE = "team_game_grades"
+GRADE_SOURCES_TABLE = "team_grade_sources"
+
+SEASON_GRADE_CATALOG = OFFENSE_GRADE_CATALOG + DEFENSE_GRADE_CATALOG
+GAME_GRADE_CATALOG = [(col, col, hib) for col, hib in GAME_HEADLINE_STATS] + [
+    (label, col, hib) for label, col, hib in GAME_STAT_CATALOG
+]
+
+GRADE_COLUMNS = ["stat_col", "value", "pct", "grade"]
+
+logger = logging.getLogger(__name__)
+
+
+# ============================
+# PAGE LOOKUPS
+# ============================
+
+def get_season_grades(team: str | None, season: int | None) -> dict[str, float]:
+    """Materialized {grade_key: pct} for one team-season (empty if not graded)."""
+    if not team or season is None:
+        return {}
+    try:
+        df = read_df(
+            f"""
+            SELECT grade_key, pct
+            FROM public.{SEASON_GRADES_TABLE}
+            WHERE team = :team
+              AND season = :season
+            """,
+            params={"team": team, "season": int(season)},
+        )
+    except Exception as exc:
+        # Grades table not built yet; pages fall back to live grading.
+        # Anything else (connection, timeout, bad SQL) is a real failure.
+        if not is_missing_table_error(exc):
+            raise
+        logger.info("%s not built yet; falling back to live grading", SEASON_GRADES_TABLE)
+        return {}
+    return dict(zip(df["grade_key"], df["pct"].astype(float)))
+
+
+def get_game_grades(game_id: str | int | None) -> pd.DataFrame:
+    """Materialized grade rows for both teams in one game (empty if not graded)."""
+    empty = pd.DataFrame(columns=["team", "label", *GRADE_COLUMNS])
+    if game_id is None:
+        return empty
+    try:
+        df = read_df(
+            f"""
+            SELECT team, label, stat_col, value, pct, grade
+            FROM public.{GAME_GRADES_TABLE}
+            WHERE game_id = :game_id
+            """,
+            params={"game_id": game_id},
+        )
+    except Exception as exc:
+        if not is_missing_table_error(exc):
+            raise
+        logger.info("%s not built yet; falling back to live grading", GAME_GRADES_TABLE)
+        return empty
+    return df
+
+
+# ============================
+# GRADING
+# ============================
+
+def _read_source(sql: str, params: dict | None = None) -> pd.DataFrame:
+    """Batch reads go straight to Neon, never through the local mirror or page caches."""
+    with get_source_engine().connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
+
+
+def _grade_rows(
+    df: pd.DataFrame,
+    key_cols: list[str],
+    catalog: list[tuple[str, str, bool]],
+    grade_fn,
+) -> pd.DataFrame:
+    """Long-format grades for every row of one season's baseline frame."""
+    index = build_percentile_index(df, [col for _, col, _ in catalog])
+    parts: list[pd.DataFrame] = []
+    for key, col, higher_is_better in catalog:
+        sorted_values = index.get(col)
+        if sorted_values is None or sorted_values.size == 0:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce")
+        graded = df.loc[values.notna(), key_cols].copy()
+        graded["grade_key"] = key
+        graded["stat_col"] = col
+        graded["value"] = values[values.notna()].astype(float)
+        # Vectorized across every team in the season.
+        graded["pct"] = percentile_ranks(
+            sorted_values, graded["value"].to_numpy(), higher_is_better=higher_is_better
+        )
+        graded["grade"] = [grade_fn(p)[0] for p in graded["pct"]]
+        parts.append(graded)
+
+    if not parts:
+        return pd.DataFrame(columns=key_cols + ["grade_key", *GRADE_COLUMNS])
+    return pd.concat(parts, ignore_index=True)
+
+
+def grade_season_stats(season: int) -> pd.DataFrame:
+    """Grade every team-season row in one season."""
+    cols = sorted({col for _, col, _ in SEASON_GRADE_CATALOG})
+    df = _read_source(
+        f"""
+        SELECT team, season, {", ".join(cols)}
+        FROM public.team_advanced_season_stats
+        WHERE season = :season
+        """,
+        params={"season": int(season)},
+    )
+    return _grade_rows(df, ["season", "team"], SEASON_GRADE_CATALOG, season_grade_from_percentile)
+
+
+def grade_game_stats(season: int) -> pd.DataFrame:
+    """Grade every FBS team-game row in one season."""
+    cols = sorted({col for _, col, _ in GAME_GRADE_CATALOG})
+    df = _read_source(
+        f"""
+        SELECT gd.season, gs.game_id, gs.team, {", ".join(f"gs.{col}" for col in cols)}
+        FROM public.team_advanced_game_stats gs
+        JOIN public.game_data gd
+          ON gd.id = gs.game_id
+        WHERE gd.season = :season
+          AND gd.homeclassification = 'fbs'
+          AND gd.awayclassification = 'fbs'
+        """,
+        params={"season": int(season)},
+    )
+    out = _grade_rows(df, ["season", "game_id", "team"], GAME_GRADE_CATALOG, game_grade_from_percentile)
+    return out.rename(columns={"grade_key": "label"})
+
+
+# ============================
+# INCREMENTAL REFRESH
+# ============================
+
+def _source_hashes() -> pd.DataFrame:
+    """One fingerprint per (scope, season) over the raw rows each grade depends on."""
+    return _read_source(
+        """
+        SELECT 'season' AS scope, s.season::int AS season,
+               md5(string_agg(s::text, '|' ORDER BY s.team)) AS source_hash
+        FROM public.team_advanced_season_stats s
+        GROUP BY s.season
+
+        UNION ALL
+
+        SELECT 'game' AS scope, gd.season::int AS season,
+               md5(string_agg(gs::text, '|' ORDER BY gs.game_id, gs.team)) AS source_hash
+        FROM public.team_advanced_game_stats gs
+        JOIN public.game_data gd
+          ON gd.id = gs.game_id
+        WHERE gd.homeclassification = 'fbs'
+          AND gd.awayclassification = 'fbs'
+        GROUP BY gd.season
+        """
+    )
+
+
+def _ensure_tables(conn) -> None:
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS public.{SEASON_GRADES_TABLE} (
+            season integer NOT NULL,
+            team text NOT NULL,
+            grade_key text NOT NULL,
+            stat_col text NOT NULL,
+            value double precision,
+            pct double precision NOT NULL,
+            grade text NOT NULL,
+            PRIMARY KEY (team, season, grade_key)
+        )
+    """))
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS public.{GAME_GRADES_TABLE} (
+            season integer NOT NULL,
+            game_id bigint NOT NULL,
+            team text NOT NULL,
+            label text NOT NULL,
+            stat_col text NOT NULL,
+            value double precision,
+            pct double precision NOT NULL,
+            grade text NOT NULL,
+            PRIMARY KEY (game_id, team, stat_col)
+        )
+    """))
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS public.{GRADE_SOURCES_TABLE} (
+            scope text NOT NULL,
+            season integer NOT NULL,
+            source_hash text NOT NULL,
+            graded_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (scope, season)
+        )
+    """))
+
+
+def _drop_grades(engine, scope: str, season: int) -> None:
+    """Remove one (scope, season)'s grades and fingerprint together."""
+    table = SEASON_GRADES_TABLE if scope == "season" else GAME_GRADES_TABLE
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM public.{table} WHERE season = :season"), {"season": season})
+        conn.execute(
+            text(f"DELETE FROM public.{GRADE_SOURCES_TABLE} WHERE scope = :scope AND season = :season"),
+            {"scope": scope, "season": season},
+        )
+
+
+def refresh_grades(
+    full: bool = False, seasons: list[int] | None = None
+) -> tuple[list[tuple[str, int]], list[tuple[str, int]]]:
+    """Regrade (scope, season) pairs whose source fingerprint moved and drop pairs whose source rows are gone.
+
+    Returns (regraded, dropped).
+    """
+    engine = get_source_engine()
+    with engine.begin() as conn:
+        _ensure_tables(conn)
+        stored = pd.read_sql(
+            text(f"SELECT scope, season, source_hash FROM public.{GRADE_SOURCES_TABLE}"), conn
+        )
+
+    current = _source_hashes()
+    if seasons:
+        current = current[current["season"].isin([int(s) for s in seasons])]
+        stored = stored[stored["season"].isin([int(s) for s in seasons])]
+
+    # Seasons no longer in the source would otherwise keep their grades forever.
+    vanished = stored.merge(current[["scope", "season"]], on=["scope", "season"], how="left", indicator=True)
+    dropped: list[tuple[str, int]] = []
+    for row in vanished[vanished["_merge"] == "left_only"].sort_values(["season", "scope"]).itertuples(index=False):
+        _drop_grades(engine, row.scope, int(row.season))
+        dropped.append((row.scope, int(row.season)))
+    if not full:
+        merged = current.merge(stored, on=["scope", "season"], how="left", suffixes=("", "_stored"))
+        current = merged.loc[merged["source_hash"] != merged["source_hash_stored"], current.columns]
+
+    regraded: list[tuple[str, int]] = []
+    for row in current.sort_values(["season", "scope"]).itertuples(index=False):
+        season = int(row.season)
+        if row.scope == "season":
+            table, graded = SEASON_GRADES_TABLE, grade_season_stats(season)
+        else:
+            table, graded = GAME_GRADES_TABLE, grade_game_stats(season)
+
+        # Swap one season at a time so readers never see a half-graded season.
+        with engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM public.{table} WHERE season = :season"), {"season": season})
+            if not graded.empty:
+                graded.to_sql(table, conn, schema="public", if_exists="append", index=False, method="multi", chunksize=5000)
+            conn.execute(
+                text(f"""
+                    INSERT INTO public.{GRADE_SOURCES_TABLE} (scope, season, source_hash, graded_at)
+                    VALUES (:scope, :season, :source_hash, now())
+                    ON CONFLICT (scope, season)
+                    DO UPDATE SET source_hash = EXCLUDED.source_hash, graded_at = EXCLUDED.graded_at
+                """),
+                {"scope": row.scope, "season": season, "source_hash": row.source_hash},
+            )
+        regraded.append((row.scope, season))
+    return regraded, dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute report card percentiles and letter grades.")
+    parser.add_argument("--full", action="store_true", help="Regrade every season, not just changed ones.")
+    parser.add_argument("--seasons", type=int, nargs="*", help="Limit the refresh to these seasons.")
+    args = parser.parse_args()
+
+    regraded, dropped = refresh_grades(full=args.full, seasons=args.seasons)
+    if not regraded and not dropped:
+        print("Grades are up to date.")
+    for scope, season in regraded:
+        print(f"Regraded {scope} grades for {season}")
+    for scope, season in dropped:
+        print(f"Dropped {scope} grades for {season} (no longer in the source tables)")
+
+
+if __name__ == "__main__":
+    main()
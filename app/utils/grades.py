@@ -0,0 +1,124 @@
+# ============================
+# SEASON REPORT CARD
+# ============================
+
+# (grade key, column in team_advanced_season_stats, higher_is_better)
+OFFENSE_GRADE_CATALOG: list[tuple[str, str, bool]] = [
+    ("offense_overall", "offense_ppa", True),
+
+    ("passing_overall", "offense_passingplays_ppa", True),
+    ("passing_efficiency", "offense_passingplays_successrate", True),
+    ("passing_explosiveness", "offense_passingplays_explosiveness", True),
+
+    ("rushing_overall", "offense_rushingplays_ppa", True),
+    ("rushing_efficiency", "offense_rushingplays_successrate", True),
+    ("rushing_explosiveness", "offense_rushingplays_explosiveness", True),
+    ("rushing_power", "offense_powersuccess", True),
+
+    ("ol_pass_protection", "offense_havoc_frontseven", False),
+    ("ol_run_blocking", "offense_lineyards", True),
+]
+
+DEFENSE_GRADE_CATALOG: list[tuple[str, str, bool]] = [
+    # Overall defense: lower is better
+    ("defense_overall", "defense_ppa", False),
+
+    # Passing
+    ("pass_overall", "defense_passingplays_ppa", False),
+    ("pass_efficiency", "defense_passingplays_successrate", False),
+    ("pass_db_havoc", "defense_havoc_db", True),
+    ("pass_explosiveness_allowed", "defense_passingplays_explosiveness", False),
+
+    # Run Stop
+    ("run_overall", "defense_rushingplays_ppa", False),
+    ("run_efficiency", "defense_rushingplays_successrate", False),
+    ("run_stuff_rate", "defense_stuffrate", True),
+    ("run_explosiveness_allowed", "defense_rushingplays_explosiveness", False),
+]
+
+
+def season_grade_from_percentile(pct: float) -> tuple[str, str, str]:
+    """Return (letter, bg_hex, fg_hex) from a 0-100 percentile.
+
+    Grade bands: A+/A/A- (94+), B+/B/B- (74+), C+/C/C- (54+), D+/D/D- (34+), F.
+    """
+    pct = float(max(0.0, min(100.0, pct)))
+
+    if pct >= 94:
+        return ("A+", "#0B3D1A", "#FFFFFF")
+    if pct >= 86:
+        return ("A", "#145A32", "#FFFFFF")
+    if pct >= 80:
+        return ("A-", "#1E7D3A", "#FFFFFF")
+    if pct >= 74:
+        return ("B+", "#2ECC71", "#0B2E13")
+    if pct >= 66:
+        return ("B", "#58D68D", "#0B2E13")
+    if pct >= 60:
+        return ("B-", "#82E0AA", "#0B2E13")
+    if pct >= 54:
+        return ("C+", "#F7DC6F", "#4D3B00")
+    if pct >= 46:
+        return ("C", "#F4D03F", "#4D3B00")
+    if pct >= 40:
+        return ("C-", "#F9E79F", "#4D3B00")
+    if pct >= 34:
+        return ("D+", "#F8C471", "#5A2E00")
+    if pct >= 26:
+        return ("D", "#F5B041", "#5A2E00")
+    if pct >= 20:
+        return ("D-", "#F0B27A", "#5A2E00")
+    return ("F", "#E74C3C", "#FFFFFF")
+
+
+# ============================
+# GAME REPORT CARD
+# ============================
+
+# Headline stats graded on every panel alongside GAME_STAT_CATALOG.
+GAME_HEADLINE_STATS: list[tuple[str, bool]] = [
+    ("offense_ppa", True),
+    ("defense_ppa", False),
+]
+
+# Sample stat catalog (we'll tune these later)
+# key: display label, value: (column_name, higher_is_better)
+GAME_STAT_CATALOG: list[tuple[str, str, bool]] = [
+    ("Offensive Success Rate", "offense_successrate", True),
+    ("Offensive Explosiveness", "offense_explosiveness", True),
+    ("Power Success", "offense_powersuccess", True),
+    ("Line Yards", "offense_lineyards", True),
+
+    ("Defensive Success Rate Allowed", "defense_successrate", False),
+    ("Defensive Explosiveness Allowed", "defense_explosiveness", False),
+    ("Stuff Rate", "defense_stuffrate", True),
+]
+
+
+def game_grade_from_percentile(pct: float) -> tuple[str, str, str]:
+    """Map percentile (0-100) to (letter, background, foreground)."""
+    if pct >= 94:
+        return ("A+", "#166534", "#FFFFFF")
+    if pct >= 86:
+        return ("A", "#15803d", "#FFFFFF")
+    if pct >= 80:
+        return ("A-", "#16a34a", "#FFFFFF")
+    if pct >= 74:
+        return ("B+", "#4ade80", "#14532d")
+    if pct >= 68:
+        return ("B", "#86efac", "#14532d")
+    if pct >= 62:
+        return ("B-", "#bbf7d0", "#14532d")
+    if pct >= 56:
+        return ("C+", "#fde68a", "#78350f")
+    if pct >= 50:
+        return ("C", "#fcd34d", "#78350f")
+    if pct >= 44:
+        return ("C-", "#fbbf24", "#78350f")
+    if pct >= 38:
+        return ("D+", "#fdba74", "#7c2d12")
+    if pct >= 32:
+        return ("D", "#fb923c", "#7c2d12")
+    if pct >= 26:
+        return ("D-", "#f97316", "#FFFFFF")
+    return ("F", "#dc2626", "#FFFFFF")
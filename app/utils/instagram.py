@@ -0,0 +1,174 @@
+"""Instagram insights, refreshed off the request path.
+
+A daemon thread keeps a local JSON store up to date:
+
+- snapshot: the rolling 30-day totals Home shows (one Graph API call)
+- days: per-day totals, fetched only for days not stored yet (backfills 30 days)
+
+Pages read the store and never wait on the Graph API. Failed refreshes back off
+exponentially. The base URL and HTTP session are injectable, so the refresher
+runs against a local stub of the insights endpoint as easily as the real one.
+"""
+import datetime as dt
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+import requests
+import streamlit as st
+
+from utils.db import get_setting
+
+logger = logging.getLogger(__name__)
+
+GRAPH_API_BASE = "https://graph.facebook.com/v24.0"
+IG_METRICS = ["accounts_engaged", "total_interactions", "views"]
+WINDOW_DAYS = 30
+REFRESH_SECONDS = 60 * 60
+BACKOFF_START_SECONDS = 60
+BACKOFF_MAX_SECONDS = 60 * 60
+REQUEST_TIMEOUT_SECONDS = 30
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent / "data" / "instagram_insights.json"
+
+
+class InstagramRefresher:
+    def __init__(
+        self,
+        ig_user_id: str,
+        token: str,
+        store_path: str | Path = DEFAULT_STORE_PATH,
+        base_url: str = GRAPH_API_BASE,
+        session: requests.Session | None = None,
+        refresh_seconds: int = REFRESH_SECONDS,
+    ):
+        self.ig_user_id = ig_user_id
+        self.token = token
+        self.store_path = Path(store_path).expanduser()
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._store = self._read_store()
+        self._thread: threading.Thread | None = None
+        self._wake = threading.Event()
+
+    # ----------------------------
+    # Store
+    # ----------------------------
+    def _read_store(self) -> dict:
+        try:
+            return json.loads(self.store_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"snapshot": None, "days": {}}
+
+    def _write_store(self) -> None:
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_path.with_name(self.store_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self._store, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.store_path)
+
+    def latest_snapshot(self) -> dict | None:
+        """Most recent 30-day totals: {metrics: {...}, since, until, fetched_at}, or None."""
+        with self._lock:
+            return self._store.get("snapshot")
+
+    def daily_history(self) -> dict[str, dict[str, int]]:
+        """{YYYY-MM-DD: {metric: value}} for every stored day."""
+        with self._lock:
+            return dict(self._store.get("days", {}))
+
+    # ----------------------------
+    # Fetching
+    # ----------------------------
+    def _fetch_totals(self, since: int, until: int) -> dict[str, int]:
+        response = self.session.get(
+            f"{self.base_url}/{self.ig_user_id}/insights",
+            params={
+                "metric": ",".join(IG_METRICS),
+                "metric_type": "total_value",
+                "period": "day",
+                "since": since,
+                "until": until,
+                "access_token": self.token,
+            },
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        data = response.json().get("data", [])
+
+        def _total(metric_name: str) -> int:
+            metric = next((m for m in data if m.get("name") == metric_name), None)
+            tv = (metric or {}).get("total_value") or {}
+            return int(tv.get("value", 0))
+
+        return {name: _total(name) for name in IG_METRICS}
+
+    def missing_days(self, today: dt.date | None = None) -> list[dt.date]:
+        """Complete days in the window that are not stored yet, oldest first."""
+        today = today or dt.date.today()
+        with self._lock:
+            stored = set(self._store.get("days", {}))
+        window = [today - dt.timedelta(days=offset) for offset in range(WINDOW_DAYS, 0, -1)]
+        return [day for day in window if day.isoformat() not in stored]
+
+    def refresh_once(self, now: float | None = None) -> None:
+        """Refresh the 30-day snapshot, then fill in missing days; raises on API errors."""
+        until = int(now if now is not None else time.time())
+        since = until - WINDOW_DAYS * 24 * 60 * 60
+        metrics = self._fetch_totals(since, until)
+        with self._lock:
+            self._store["snapshot"] = {"metrics": metrics, "since": since, "until": until, "fetched_at": int(time.time())}
+            self._write_store()
+
+        for day in self.missing_days(dt.datetime.fromtimestamp(until).date()):
+            start = int(dt.datetime.combine(day, dt.time.min).timestamp())
+            totals = self._fetch_totals(start, start + 24 * 60 * 60)
+            with self._lock:
+                self._store.setdefault("days", {})[day.isoformat()] = totals
+                self._write_store()
+
+    # ----------------------------
+    # Background loop
+    # ----------------------------
+    def _run(self) -> None:
+        failures = 0
+        while True:
+            try:
+                self.refresh_once()
+                failures = 0
+                delay = self.refresh_seconds
+            except Exception as exc:
+                failures += 1
+                delay = min(BACKOFF_MAX_SECONDS, BACKOFF_START_SECONDS * 2 ** (failures - 1))
+                delay *= random.uniform(0.8, 1.2)
+                # HTTP errors echo the request URL, which carries the access token.
+                message = str(exc).replace(self.token, "***") if self.token else str(exc)
+                logger.warning("Instagram refresh failed (%d in a row), retrying in %.0fs: %s", failures, delay, message)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def start(self) -> "InstagramRefresher":
+        """Start the daemon thread once; returns self for chaining."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="instagram-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def refresh_now(self) -> None:
+        """Wake the background loop early (e.g. after an operator fixes the token)."""
+        self._wake.set()
+
+
+@st.cache_resource
+def get_instagram_refresher(ig_user_id: str, token: str) -> InstagramRefresher:
+    """One running refresher per process; IG_GRAPH_BASE_URL / IG_HISTORY_PATH override the defaults."""
+    return InstagramRefresher(
+        ig_user_id,
+        token,
+        store_path=get_setting("IG_HISTORY_PATH") or DEFAULT_STORE_PATH,
+        base_url=get_setting("IG_GRAPH_BASE_URL") or GRAPH_API_BASE,
+    ).start()
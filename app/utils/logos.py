@@ -0,0 +1,179 @@
+"""Local, content-addressed team logo store.
+
+Build or refresh the store (run from the app/ directory):
+
+    python -m utils.logos               # download any logo not cached yet, then build variants
+    python -m utils.logos --offline     # rebuild variants from cached originals only
+
+Layout (both directories are git-ignored):
+
+    <LOGO_CACHE_DIR, default data/logos>/
+        objects/<sha256>.<ext>    original bytes, named by content hash
+        manifest.json             {logo url: sha256}
+    static/logos/
+        <sha256>_<px>.png         square, transparent-padded PNG per size
+
+Variants are served by Streamlit static serving (see utils.static_assets) under
+content-addressed names, so browsers cache each one indefinitely. logo_src()
+swaps a remote logo URL for the served variant's URL and falls back to the
+remote URL when the logo was never cached. Nothing is fetched at page time, so
+a pre-populated store works with no network at all.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import urllib.request
+from pathlib import Path
+
+import streamlit as st
+from sqlalchemy import text
+
+from utils.db import get_setting, get_source_engine
+from utils.static_assets import STATIC_DIR, served_url
+
+VARIANT_SIZES = (32, 64, 128)
+DEFAULT_LOGO_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "logos"
+VARIANT_DIR = STATIC_DIR / "logos"
+
+
+def get_logo_cache_dir() -> Path:
+    return Path(get_setting("LOGO_CACHE_DIR") or DEFAULT_LOGO_CACHE_DIR).expanduser()
+
+
+def _manifest_path(cache_dir: Path) -> Path:
+    return cache_dir / "manifest.json"
+
+
+def _read_manifest(cache_dir: Path) -> dict[str, str]:
+    path = _manifest_path(cache_dir)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+# ============================
+# PAGE LOOKUPS
+# ============================
+
+@st.cache_resource(max_entries=4)
+def _load_logo_urls(cache_dir: str, manifest_mtime: float, size: int) -> dict[str, str]:
+    """{logo url: served variant URL} for one size; rebuilt when the manifest changes."""
+    urls: dict[str, str] = {}
+    for url, digest in _read_manifest(Path(cache_dir)).items():
+        variant = VARIANT_DIR / f"{digest}_{size}.png"
+        if variant.exists():
+            urls[url] = served_url(variant)
+    return urls
+
+
+def get_logo_urls(size: int = 64) -> dict[str, str]:
+    """Shared, read-only {logo url: served URL} map (empty when the store is not built)."""
+    cache_dir = get_logo_cache_dir()
+    manifest = _manifest_path(cache_dir)
+    if not manifest.exists():
+        return {}
+    return _load_logo_urls(str(cache_dir), manifest.stat().st_mtime, size)
+
+
+def logo_src(url: str | None, size: int = 64) -> str | None:
+    """Locally served URL for a logo, or the remote URL itself when it isn't cached."""
+    if not isinstance(url, str) or not url.strip():
+        return None
+    return get_logo_urls(size).get(url, url)
+
+
+# ============================
+# BUILD
+# ============================
+
+def _download(url: str, timeout: float = 20.0) -> bytes:
+    request = urllib.request.Request(url, headers={"User-Agent": "bg-analytics-logo-cache/1.0"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def _store_object(cache_dir: Path, url: str, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    ext = Path(url.split("?", 1)[0]).suffix.lower() or ".png"
+    path = cache_dir / "objects" / f"{digest}{ext}"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return digest
+
+
+def _build_variants(cache_dir: Path, digest: str, variant_dir: Path = VARIANT_DIR) -> None:
+    from PIL import Image
+
+    original = next((cache_dir / "objects").glob(f"{digest}.*"))
+    with Image.open(original) as image:
+        image = image.convert("RGBA")
+        bbox = image.getbbox()
+        if bbox:
+            image = image.crop(bbox)
+        for size in VARIANT_SIZES:
+            path = variant_dir / f"{digest}_{size}.png"
+            if path.exists():
+                continue
+            thumb = image.copy()
+            thumb.thumbnail((size, size), Image.Resampling.LANCZOS)
+            canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+            canvas.paste(thumb, ((size - thumb.width) // 2, (size - thumb.height) // 2), thumb)
+            buffer = io.BytesIO()
+            canvas.save(buffer, format="PNG", optimize=True)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(buffer.getvalue())
+
+
+def list_logo_urls() -> list[str]:
+    with get_source_engine().connect() as conn:
+        rows = conn.execute(text('SELECT DISTINCT "Logo" FROM public.team_map WHERE "Logo" IS NOT NULL')).fetchall()
+    return sorted(row[0] for row in rows if row[0])
+
+
+def sync_logos(cache_dir: Path, offline: bool = False) -> dict[str, int]:
+    """Download uncached logos (unless offline) and build any missing variants."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+    stats = {"downloaded": 0, "failed": 0, "cached": len(manifest)}
+
+    if not offline:
+        for url in list_logo_urls():
+            if url in manifest:
+                continue
+            try:
+                manifest[url] = _store_object(cache_dir, url, _download(url))
+                stats["downloaded"] += 1
+            except Exception as exc:
+                print(f"Failed to fetch {url}: {exc}")
+                stats["failed"] += 1
+
+    for digest in set(manifest.values()):
+        try:
+            _build_variants(cache_dir, digest)
+        except Exception as exc:
+            # e.g. SVG originals Pillow can't open; pages fall back to the remote URL.
+            print(f"Failed to build variants for {digest}: {exc}")
+
+    tmp_path = _manifest_path(cache_dir).with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, _manifest_path(cache_dir))
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cache team logos locally and build resized variants.")
+    parser.add_argument("--cache-dir", help="Originals + manifest location (default: LOGO_CACHE_DIR or data/logos).")
+    parser.add_argument("--offline", action="store_true", help="Don't download; rebuild variants from cached originals.")
+    args = parser.parse_args()
+
+    cache_dir = Path(args.cache_dir).expanduser() if args.cache_dir else get_logo_cache_dir()
+    stats = sync_logos(cache_dir, offline=args.offline)
+    print(
+        f"Logo store at {cache_dir} (variants in {VARIANT_DIR}): {stats['downloaded']} downloaded, "
+        f"{stats['failed']} failed, {stats['cached']} already cached"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Local DuckDB mirror of the read-mostly Neon tables.
+
+Sync (run from the app/ directory, e.g. from cron):
+
+    python -m utils.mirror data/mirror.duckdb
+    python -m utils.mirror data/mirror.duckdb --every 900   # keep syncing every 15 minutes
+
+Then point the app at it with LOCAL_MIRROR_PATH (Streamlit secret or env var).
+utils.db.read_df serves the existing SQL from the mirror, tables live under a
+`public` schema so queries run unchanged. Requires `duckdb` and
+`duckdb-engine`, which are only needed when the mirror is used.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from utils.db import get_source_engine, iter_arrow_batches
+
+MIRROR_TABLES = [
+    "game_data",
+    "team_map",
+    "venue_map",
+    "rankings",
+    "team_ratings",
+    "game_prediction_runs",
+    "game_predictions_full",
+    "season_predictions_full",
+    "ranking_projections_full",
+    "simulated_season_predictions",
+    "team_season_grades",
+    "team_game_grades",
+]
+MIRROR_TABLE_PREFIXES = ["team_advanced_"]
+
+
+def list_mirror_tables(conn) -> list[str]:
+    """Mirror tables that actually exist in the source database."""
+    df = pd.read_sql(
+        text(
+            """
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+            ORDER BY table_name
+            """
+        ),
+        conn,
+    )
+    return [
+        name
+        for name in df["table_name"]
+        if name in MIRROR_TABLES or any(name.startswith(prefix) for prefix in MIRROR_TABLE_PREFIXES)
+    ]
+
+
+def _copy_table(source_conn, duck, table: str) -> int:
+    """Stream one Postgres table into the DuckDB file as Arrow batches; returns rows copied."""
+    rows = 0
+    created = False
+    for batch in iter_arrow_batches(source_conn, f'SELECT * FROM public."{table}"'):
+        duck.register("mirror_batch", batch)
+        if not created:
+            duck.execute(f'CREATE TABLE public."{table}" AS SELECT * FROM mirror_batch')
+            created = True
+        else:
+            duck.execute(f'INSERT INTO public."{table}" SELECT * FROM mirror_batch')
+        duck.unregister("mirror_batch")
+        rows += batch.num_rows
+    return rows
+
+
+def sync_mirror(path: str | Path) -> dict[str, int]:
+    """Rebuild the mirror file from Neon; swapped in atomically so readers never see a partial sync."""
+    import duckdb
+
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    copied: dict[str, int] = {}
+    duck = duckdb.connect(str(tmp_path))
+    try:
+        duck.execute("CREATE SCHEMA IF NOT EXISTS public")
+        with get_source_engine().connect() as source_conn:
+            for table in list_mirror_tables(source_conn):
+                copied[table] = _copy_table(source_conn, duck, table)
+        duck.execute("CHECKPOINT")
+    finally:
+        duck.close()
+
+    os.replace(tmp_path, path)
+    return copied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync the local DuckDB mirror of the Neon tables.")
+    parser.add_argument("path", help="Mirror file to write, e.g. data/mirror.duckdb")
+    parser.add_argument("--every", type=int, default=0, help="Keep syncing every N seconds.")
+    args = parser.parse_args()
+
+    while True:
+        started = time.monotonic()
+        copied = sync_mirror(args.path)
+        elapsed = time.monotonic() - started
+        print(f"Synced {len(copied)} tables ({sum(copied.values()):,} rows) in {elapsed:.1f}s")
+        if args.every <= 0:
+            break
+        time.sleep(max(0.0, args.every - elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from utils.db import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Shared by every session; fetches are I/O bound, so threads are enough.
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="page-fetch")
+
+
+def _timed(name: str, fn: Callable[[], Any], ctx) -> tuple[Any, float]:
+    if ctx is not None:
+        # Lets st.* calls (caches, secrets) inside the fetch see the session.
+        add_script_run_ctx(ctx=ctx)
+    started = time.perf_counter()
+    try:
+        return fn(), time.perf_counter() - started
+    finally:
+        logger.info("fetch %s took %.0f ms", name, (time.perf_counter() - started) * 1000)
+
+
+def run_concurrently(tasks: dict[str, Callable[[], Any]]) -> tuple[dict[str, Any], dict[str, float]]:
+    """Run independent fetches at once; returns ({name: result}, {name: seconds}).
+
+    Latency is the slowest fetch rather than the sum. The first failing fetch
+    re-raises here, same as if the fetches had run in sequence.
+    """
+    ctx = get_script_run_ctx()
+    futures = {name: _POOL.submit(_timed, name, fn, ctx) for name, fn in tasks.items()}
+    results: dict[str, Any] = {}
+    timings: dict[str, float] = {}
+    for name, future in futures.items():
+        results[name], timings[name] = future.result()
+    return results, timings
+
+
+def render_fetch_timings(timings: dict[str, float]) -> None:
+    """Per-fetch timings, slowest first, in a collapsed expander; only when SHOW_FETCH_TIMINGS is set."""
+    if str(get_setting("SHOW_FETCH_TIMINGS") or "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return
+    with st.expander("Fetch timings"):
+        st.caption(
+            " | ".join(
+                f"{name}: {seconds * 1000:.0f} ms"
+                for name, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True)
+            )
+        )
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+
+def build_percentile_index(df: pd.DataFrame, columns: list[str]) -> dict[str, np.ndarray]:
+    """Build {column: sorted non-null values} from one wide league fetch."""
+    index: dict[str, np.ndarray] = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce").dropna().to_numpy(dtype=float)
+        sorted_values = np.sort(values)
+        # Shared across sessions through st.cache_resource, so keep it read-only.
+        sorted_values.setflags(write=False)
+        index[col] = sorted_values
+    return index
+
+
+def percentile_ranks(sorted_values: np.ndarray, values, higher_is_better: bool = True) -> np.ndarray:
+    """Percentile (0-100) of each value vs a sorted baseline, via binary search.
+
+    Matches appending the value to the baseline and taking pandas
+    rank(pct=True) (average method) of the appended observation.
+    """
+    values = np.asarray(values, dtype=float)
+    n = sorted_values.size
+    left = np.searchsorted(sorted_values, values, side="left")
+    right = np.searchsorted(sorted_values, values, side="right")
+    ties = right - left
+    below = left if higher_is_better else n - right
+    return (below + 1 + ties / 2.0) / (n + 1) * 100.0
+
+
+def percentile_from_index(
+    index: dict[str, np.ndarray],
+    stat_col: str,
+    value: float,
+    higher_is_better: bool = True,
+) -> float:
+    """Percentile (0-100) for one value; neutral 50 when there is no baseline."""
+    sorted_values = index.get(stat_col)
+    if sorted_values is None or sorted_values.size == 0:
+        return 50.0
+    return float(percentile_ranks(sorted_values, [value], higher_is_better=higher_is_better)[0])
+
+
+def catalog_percentiles(
+    index: dict[str, np.ndarray],
+    df: pd.DataFrame,
+    catalog: list[tuple[str, str, bool]],
+) -> pd.DataFrame:
+    """Long-format percentiles for every row of df across a (label, column, higher_is_better) catalog.
+
+    Each catalog entry is one percentile_ranks call covering all rows. Missing
+    values are skipped; a column with no baseline gets a neutral 50, as in
+    percentile_from_index. Returns df's index as `row`, plus label, col, value, pct.
+    """
+    parts: list[pd.DataFrame] = []
+    for label, col, higher_is_better in catalog:
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce").dropna().astype(float)
+        if values.empty:
+            continue
+        sorted_values = index.get(col)
+        if sorted_values is None or sorted_values.size == 0:
+            pct = np.full(values.size, 50.0)
+        else:
+            pct = percentile_ranks(sorted_values, values.to_numpy(), higher_is_better=higher_is_better)
+        parts.append(
+            pd.DataFrame({"row": values.index, "label": label, "col": col, "value": values.to_numpy(), "pct": pct})
+        )
+
+    if not parts:
+        return pd.DataFrame(columns=["row", "label", "col", "value", "pct"])
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,189 @@
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached result counts as fresh, by table. A query gets the shortest
+# TTL of the tables it reads; stale results are still served while a refresh runs.
+# Tables with a watermark (below) are not on a timer.
+DEFAULT_TTL = 300
+TABLE_TTLS: dict[str, int] = {
+    "team_map": 6 * 60 * 60,
+    "venue_map": 6 * 60 * 60,
+    "team_advanced_season_stats": 60 * 60,
+    "team_advanced_game_stats": 60 * 60,
+    "team_season_grades": 60 * 60,
+    "team_game_grades": 60 * 60,
+}
+
+# Change detection: cheap watermark queries polled in the background. Results
+# that read these tables are kept until their watermark moves instead of
+# expiring on a timer (WATERMARKED_MAX_TTL is only a safety net).
+WATERMARK_POLL_SECONDS = 60
+WATERMARKED_MAX_TTL = 24 * 60 * 60
+WATERMARKS: dict[str, str] = {
+    "game_data": """
+        SELECT
+            COUNT(*) AS n_games,
+            COUNT(homepoints) AS n_scored,
+            MAX(startdate) AS last_start
+        FROM public.game_data
+    """,
+    # Pages read the latest *successful* run, so a run flipping from pending to
+    # success has to move the mark too.
+    "game_prediction_runs": """
+        SELECT
+            MAX(created_at) FILTER (WHERE status = 'success') AS last_success,
+            COUNT(*) FILTER (WHERE status = 'success') AS n_success
+        FROM public.game_prediction_runs
+    """,
+    "season_predictions_full": """
+        SELECT MAX(created_at) AS last_created
+        FROM public.season_predictions_full
+    """,
+    "ranking_projections_full": """
+        SELECT MAX(run_date) AS last_run_date, MAX(created_at) AS last_created
+        FROM public.ranking_projections_full
+    """,
+    "simulated_season_predictions": """
+        SELECT MAX(created_at) AS last_created
+        FROM public.simulated_season_predictions
+    """,
+    "rankings": """
+        SELECT COUNT(*) AS n_rows, MAX(season) AS last_season, MAX(week) AS last_week, SUM(rank) AS rank_sum
+        FROM public.rankings
+    """,
+    "team_ratings": """
+        SELECT COUNT(*) AS n_rows, MAX(asof_date) AS last_asof, SUM(rating_value) AS rating_sum
+        FROM public.team_ratings
+    """,
+}
+# Table -> watermark that moves when the table's contents change.
+WATERMARK_TABLES: dict[str, str] = {
+    "game_data": "game_data",
+    "game_prediction_runs": "game_prediction_runs",
+    "game_predictions_full": "game_prediction_runs",
+    "season_predictions_full": "season_predictions_full",
+    "ranking_projections_full": "ranking_projections_full",
+    "simulated_season_predictions": "simulated_season_predictions",
+    "rankings": "rankings",
+    "team_ratings": "team_ratings",
+}
+
+_TABLE_RE = re.compile(r'\b(?:from|join)\s+(?:"?\w+"?\.)?"?(\w+)"?', re.IGNORECASE)
+
+
+def query_tables(sql: str) -> set[str]:
+    """Table names a query reads (FROM / JOIN targets, schema stripped)."""
+    return {name.lower() for name in _TABLE_RE.findall(sql)}
+
+
+def query_watermarks(sql: str) -> frozenset[str]:
+    """Watermarks whose movement invalidates this query's cached result."""
+    return frozenset(WATERMARK_TABLES[t] for t in query_tables(sql) if t in WATERMARK_TABLES)
+
+
+def query_ttl(sql: str) -> int:
+    """TTL for a query: the shortest TTL among the tables it reads that have no watermark."""
+    tables = query_tables(sql)
+    ttls = [TABLE_TTLS[t] for t in tables if t in TABLE_TTLS and t not in WATERMARK_TABLES]
+    if ttls:
+        return min(ttls)
+    if any(t in WATERMARK_TABLES for t in tables):
+        return WATERMARKED_MAX_TTL
+    return DEFAULT_TTL
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "ttl", "tags")
+
+    def __init__(self, value: Any, ttl: float, tags: frozenset[str]):
+        self.value = value
+        self.fetched_at = time.monotonic()
+        self.ttl = ttl
+        self.tags = tags
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.fetched_at < self.ttl
+
+
+class QueryCache:
+    """Stale-while-revalidate cache with single-flight loading.
+
+    - Fresh hit: return the cached value.
+    - Stale hit: return the cached value now and refresh it in the background.
+    - Miss: load once; concurrent callers for the same key wait on that load.
+
+    Entries can carry tags (watermark names); invalidate_tag drops them.
+    """
+
+    def __init__(self, max_entries: int = 2000, refresh_workers: int = 4):
+        self._entries: dict[Hashable, _Entry] = {}
+        self._inflight: dict[Hashable, Future] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="query-refresh")
+
+    def get(self, key: Hashable, loader: Callable[[], Any], ttl: float, tags: frozenset[str] = frozenset()) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not entry.is_fresh() and key not in self._inflight:
+                    future: Future = Future()
+                    self._inflight[key] = future
+                    self._refresher.submit(self._load, key, loader, ttl, tags, future)
+                return entry.value
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if owner:
+            self._load(key, loader, ttl, tags, future)
+        return future.result()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], ttl: float, tags: frozenset[str], future: Future) -> None:
+        with self._lock:
+            started = {tag: self._generations.get(tag, 0) for tag in tags}
+        try:
+            value = loader()
+        except Exception as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+                stale = key in self._entries
+            if stale:
+                # Keep serving the stale value; the next stale hit retries.
+                logger.warning("Background refresh failed for %r: %s", key, exc)
+            future.set_exception(exc)
+            return
+
+        with self._lock:
+            if any(self._generations.get(tag, 0) != gen for tag, gen in started.items()):
+                # A watermark moved mid-load; serve this once, then refresh.
+                ttl = 0
+            self._entries[key] = _Entry(value, ttl, tags)
+            self._inflight.pop(key, None)
+            if len(self._entries) > self._max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k].fetched_at)
+                self._entries.pop(oldest, None)
+        future.set_result(value)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Drop every entry tagged with `tag`; returns how many were dropped."""
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, entry in self._entries.items() if tag in entry.tags]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
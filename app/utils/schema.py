@@ -0,0 +1,57 @@
+from typing import Callable, Iterable
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+from utils.db import get_engine
+
+
+def quote_identifier(identifier: str) -> str:
+    return f'"{identifier.replace(chr(34), chr(34) * 2)}"'
+
+
+@st.cache_resource
+def _get_registry() -> dict:
+    """Every public table's columns from one introspection query, plus compiled statements.
+
+    Built once per process; schema changes show up only after refresh_schema().
+    """
+    with get_engine().connect() as conn:
+        df = pd.read_sql(
+            text(
+                """
+                SELECT table_name, column_name
+                FROM information_schema.columns
+                WHERE table_schema = 'public'
+                """
+            ),
+            conn,
+        )
+    columns: dict[str, frozenset[str]] = {
+        table: frozenset(group) for table, group in df.groupby("table_name")["column_name"]
+    }
+    return {"columns": columns, "statements": {}}
+
+
+def refresh_schema() -> None:
+    """Re-introspect on next use and recompile every statement."""
+    _get_registry.clear()
+
+
+def get_table_columns(table_name: str) -> frozenset[str]:
+    """Columns of public.<table_name> (empty if the table does not exist)."""
+    return _get_registry()["columns"].get(table_name, frozenset())
+
+
+def pick_column(table_name: str, candidates: Iterable[str]) -> str | None:
+    """First candidate column name that exists on the table."""
+    columns = get_table_columns(table_name)
+    return next((col for col in candidates if col in columns), None)
+
+
+def compiled_statement(name: str, build: Callable[[], str | None]) -> str | None:
+    """SQL built once per schema snapshot; `build` resolves columns and returns None if it can't."""
+    statements = _get_registry()["statements"]
+    if name not in statements:
+        statements[name] = build()
+    return statements[name]
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.db import read_df
+from utils.teams import get_game_data_watermark
+
+
+@st.cache_resource(max_entries=1)
+def _build_season_calendar(watermark: str) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+    """Per season: each week's first Eastern game date (sorted) and the running max week.
+
+    Rebuilt only when the game_data watermark moves.
+    """
+    df = read_df(
+        """
+        SELECT
+            season::int AS season,
+            week::int AS week,
+            MIN((startdate AT TIME ZONE 'America/New_York')::date) AS first_date
+        FROM public.game_data
+        WHERE week IS NOT NULL
+          AND startdate IS NOT NULL
+        GROUP BY season, week
+        """
+    )
+    calendar: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+    if df.empty:
+        return calendar
+
+    df["first_date"] = pd.to_datetime(df["first_date"]).dt.normalize()
+    for season, group in df.sort_values(["season", "first_date", "week"]).groupby("season"):
+        dates = group["first_date"].to_numpy(dtype="datetime64[D]")
+        weeks = np.maximum.accumulate(group["week"].to_numpy(dtype=np.int64))
+        dates.flags.writeable = False
+        weeks.flags.writeable = False
+        calendar[int(season)] = (dates, weeks)
+    return calendar
+
+
+def get_projection_week(season: int | None, as_of) -> int:
+    """Week after the latest week with a game on or before `as_of` (Eastern date); 1 before any game."""
+    if season is None or as_of is None or pd.isna(as_of):
+        return 1
+    entry = _build_season_calendar(get_game_data_watermark()).get(int(season))
+    if entry is None:
+        return 1
+
+    dates, weeks = entry
+    day = np.datetime64(pd.Timestamp(as_of).date(), "D")
+    idx = int(np.searchsorted(dates, day, side="right"))
+    return int(weeks[idx - 1]) + 1 if idx > 0 else 1
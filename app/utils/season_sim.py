@@ -0,0 +1,431 @@
+"""Monte Carlo season simulator.
+
+Batch job (run from the app/ directory):
+
+    python -m utils.season_sim                          # current season, 20,000 seasons
+    python -m utils.season_sim --sims 50000 --workers 8
+    python -m utils.season_sim --rating-model sp_plus   # price games off team_ratings instead
+
+Plays out the rest of the FBS regular season (games against non-FBS opponents
+count toward the FBS team's wins), every conference title game and
+a 12-team playoff (five highest-ranked conference champions get in, straight
+seeding, top four get byes). Per-game odds come from the latest successful
+game_prediction_runs run, or from team_ratings with --rating-model. Results land
+in public.simulated_season_predictions with the same columns the projections
+page reads from season_predictions_full, so the page can fall back to them.
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from utils.db import get_source_engine
+from utils.win_distribution import NON_FBS_OPPONENT_WIN_PROB
+
+SIMULATED_PREDICTIONS_TABLE = "simulated_season_predictions"
+
+MAX_WINS = 13
+PLAYOFF_TEAMS = 12
+PLAYOFF_BYES = 4
+PLAYOFF_AUTO_BIDS = 5
+SHARD_SIMS = 2_000
+
+# Rating points per logit unit and home edge when pricing games off team_ratings
+# (point-margin ratings such as SP+ or SRS).
+POINTS_PER_LOGIT = 9.0
+HOME_FIELD_POINTS = 2.5
+# Committee ranking stand-in: win% weight relative to team strength (logits).
+RESUME_WIN_WEIGHT = 4.0
+
+
+def _win_column(wins: int) -> str:
+    return "probability_1_win" if wins == 1 else f"probability_{wins}_wins"
+
+
+WIN_COLUMNS = [_win_column(wins) for wins in range(MAX_WINS + 1)]
+ODDS_COLUMNS = ["conference_champion_prob", "playoff_prob", "national_champion_prob"]
+
+
+def _read_source(sql: str, params: dict | None = None) -> pd.DataFrame:
+    with get_source_engine().connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+# ============================
+# INPUTS
+# ============================
+
+def load_schedule(season: int) -> pd.DataFrame:
+    """Season's games with an FBS team on either side, with the latest successful run's home win probability."""
+    return _read_source(
+        """
+        WITH latest_run AS (
+            SELECT game_prediction_run_id
+            FROM public.game_prediction_runs
+            WHERE season = :season
+              AND status = 'success'
+            ORDER BY created_at DESC
+            LIMIT 1
+        )
+        SELECT
+            g.*,
+            p.homewinprob AS model_homewinprob
+        FROM public.game_data g
+        LEFT JOIN latest_run r
+          ON TRUE
+        LEFT JOIN public.game_predictions_full p
+          ON p.game_prediction_run_id = r.game_prediction_run_id
+         AND p.gameid = g.id::text
+        WHERE g.season = :season
+          AND g.startdate IS NOT NULL
+          AND (g.homeclassification = 'fbs' OR g.awayclassification = 'fbs')
+        """,
+        params={"season": int(season)},
+    )
+
+
+def load_ratings(rating_model: str) -> pd.Series:
+    """Latest team_ratings snapshot for one model, keyed by game_data team id."""
+    df = _read_source(
+        """
+        SELECT tm."Id"::text AS team_id, tr.rating_value
+        FROM public.team_ratings tr
+        JOIN public.team_map tm
+          ON tm.cfb_name = tr.team
+        WHERE tr.rating_model = :model
+          AND tr.asof_date = (
+              SELECT MAX(asof_date)
+              FROM public.team_ratings
+              WHERE rating_model = :model
+          )
+        """,
+        params={"model": rating_model},
+    )
+    return pd.Series(df["rating_value"].astype(float).to_numpy(), index=df["team_id"])
+
+
+def _fit_strengths(
+    home: np.ndarray, away: np.ndarray, neutral: np.ndarray, p_home: np.ndarray, n_teams: int
+) -> tuple[np.ndarray, float]:
+    """Logit-scale team strengths and home edge that best reproduce the model's game odds (no edge at neutral sites)."""
+    known = ~np.isnan(p_home)
+    logits = np.log(np.clip(p_home[known], 0.01, 0.99) / (1 - np.clip(p_home[known], 0.01, 0.99)))
+    rows = np.arange(known.sum())
+    design = np.zeros((known.sum() + n_teams, n_teams + 1))
+    design[rows, home[known]] += 1.0
+    design[rows, away[known]] -= 1.0
+    design[rows, n_teams] = (~neutral[known]).astype(float)
+    # Light ridge pulls teams without priced games to average and pins the scale.
+    design[known.sum() + np.arange(n_teams), np.arange(n_teams)] = 0.1
+    target = np.concatenate([logits, np.zeros(n_teams)])
+    solution, *_ = np.linalg.lstsq(design, target, rcond=None)
+    return solution[:n_teams], float(solution[n_teams])
+
+
+def _non_fbs_games(games: pd.DataFrame, team_pos: pd.Series, use_model: bool) -> dict[str, np.ndarray]:
+    """FBS side, result and win probability of each game against a non-FBS opponent."""
+    fbs_home = games["homeclassification"].astype(str).str.lower().eq("fbs").to_numpy()
+    team_ids = np.where(fbs_home, games["homeid"].astype(str), games["awayid"].astype(str))
+    home_points = pd.to_numeric(games["homepoints"], errors="coerce").to_numpy(dtype=float)
+    away_points = pd.to_numeric(games["awaypoints"], errors="coerce").to_numpy(dtype=float)
+    team_points = np.where(fbs_home, home_points, away_points)
+    opp_points = np.where(fbs_home, away_points, home_points)
+    played = ~np.isnan(team_points) & ~np.isnan(opp_points)
+
+    p_home = (
+        pd.to_numeric(games["model_homewinprob"], errors="coerce").to_numpy(dtype=float)
+        if use_model
+        else np.full(len(games), np.nan)
+    )
+    p_home = np.where(p_home > 1, p_home / 100.0, p_home)
+    p_win = np.where(fbs_home, p_home, 1.0 - p_home)
+    return {
+        "team": team_pos.reindex(team_ids).to_numpy(dtype=np.int64),
+        "played": played,
+        "won": played & (team_points > opp_points),
+        "p_win": np.clip(np.where(np.isnan(p_win), NON_FBS_OPPONENT_WIN_PROB, p_win), 0.0, 1.0),
+    }
+
+
+def build_inputs(schedule: pd.DataFrame, ratings: pd.Series | None = None) -> tuple[dict, pd.DataFrame]:
+    """Arrays the simulator works on, plus the team table (team_id, team, conference).
+
+    Only FBS teams are simulated and returned. Games against non-FBS opponents
+    count toward the FBS side's wins: played ones as results, remaining ones at
+    the model's odds, or NON_FBS_OPPONENT_WIN_PROB when it has none.
+    """
+    if "seasontype" in schedule.columns:
+        schedule = schedule[schedule["seasontype"].astype(str).str.lower() != "postseason"]
+    schedule = schedule.reset_index(drop=True)
+    home_fbs = schedule["homeclassification"].astype(str).str.lower().eq("fbs")
+    away_fbs = schedule["awayclassification"].astype(str).str.lower().eq("fbs")
+
+    side_columns = ["team_id", "team", "conference", "startdate"]
+    sides = pd.concat(
+        [
+            schedule.loc[home_fbs, ["homeid", "hometeam", "homeconference", "startdate"]].set_axis(side_columns, axis=1),
+            schedule.loc[away_fbs, ["awayid", "awayteam", "awayconference", "startdate"]].set_axis(side_columns, axis=1),
+        ],
+        ignore_index=True,
+    )
+    sides["team_id"] = sides["team_id"].astype(str)
+    teams = (
+        sides.sort_values("startdate")
+        .drop_duplicates("team_id", keep="last")[["team_id", "team", "conference"]]
+        .sort_values("team")
+        .reset_index(drop=True)
+    )
+    team_pos = pd.Series(np.arange(len(teams)), index=teams["team_id"])
+    n_teams = len(teams)
+
+    non_fbs = _non_fbs_games(schedule[home_fbs != away_fbs].reset_index(drop=True), team_pos, use_model=ratings is None)
+    schedule = schedule[home_fbs & away_fbs].reset_index(drop=True)
+
+    home = team_pos.reindex(schedule["homeid"].astype(str)).to_numpy()
+    away = team_pos.reindex(schedule["awayid"].astype(str)).to_numpy()
+    conferences = sorted(c for c in teams["conference"].dropna().unique() if c != "FBS Independents")
+    conf_pos = {c: i for i, c in enumerate(conferences)}
+    team_conf = teams["conference"].map(conf_pos).fillna(-1).astype(int).to_numpy()
+    is_conf = (team_conf[home] == team_conf[away]) & (team_conf[home] >= 0)
+
+    home_points = pd.to_numeric(schedule["homepoints"], errors="coerce").to_numpy()
+    away_points = pd.to_numeric(schedule["awaypoints"], errors="coerce").to_numpy()
+    played = ~np.isnan(home_points) & ~np.isnan(away_points)
+    home_won = played & (home_points > away_points)
+    away_won = played & (away_points > home_points)
+
+    neutral = (
+        schedule["neutralsite"].fillna(False).astype(bool).to_numpy()
+        if "neutralsite" in schedule.columns
+        else np.zeros(len(schedule), dtype=bool)
+    )
+    if ratings is not None:
+        strength = ratings.reindex(teams["team_id"]).to_numpy(dtype=float) / POINTS_PER_LOGIT
+        strength = np.where(np.isnan(strength), np.nanmedian(strength) if np.isfinite(strength).any() else 0.0, strength)
+        home_edge = HOME_FIELD_POINTS / POINTS_PER_LOGIT
+        p_home = _sigmoid(strength[home] - strength[away] + np.where(neutral, 0.0, home_edge))
+    else:
+        p_model = pd.to_numeric(schedule["model_homewinprob"], errors="coerce").to_numpy(dtype=float)
+        p_model = np.where(p_model > 1, p_model / 100.0, p_model)
+        strength, home_edge = _fit_strengths(home, away, neutral, p_model, n_teams)
+        p_fit = _sigmoid(strength[home] - strength[away] + np.where(neutral, 0.0, home_edge))
+        p_home = np.where(np.isnan(p_model), p_fit, p_model)
+
+    remaining = ~played
+    inputs = {
+        "n_teams": n_teams,
+        "n_conferences": len(conferences),
+        "team_conf": team_conf,
+        "strength": strength,
+        "games_played": (
+            np.bincount(home, minlength=n_teams)
+            + np.bincount(away, minlength=n_teams)
+            + np.bincount(non_fbs["team"], minlength=n_teams)
+        ),
+        "conf_games": np.bincount(home[is_conf], minlength=n_teams) + np.bincount(away[is_conf], minlength=n_teams),
+        "fixed_wins": (
+            np.bincount(home[home_won], minlength=n_teams)
+            + np.bincount(away[away_won], minlength=n_teams)
+            + np.bincount(non_fbs["team"][non_fbs["won"]], minlength=n_teams)
+        ),
+        "fixed_conf_wins": (
+            np.bincount(home[home_won & is_conf], minlength=n_teams)
+            + np.bincount(away[away_won & is_conf], minlength=n_teams)
+        ),
+        "home": home[remaining],
+        "away": away[remaining],
+        "p_home": np.clip(p_home[remaining], 0.0, 1.0),
+        "is_conf": is_conf[remaining],
+        "non_fbs_team": non_fbs["team"][~non_fbs["played"]],
+        "non_fbs_p": non_fbs["p_win"][~non_fbs["played"]],
+    }
+    return inputs, teams
+
+
+# ============================
+# SIMULATION
+# ============================
+
+def _play(rng: np.random.Generator, strength: np.ndarray, a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Neutral-site games between team index arrays a and b; returns (winners, losers)."""
+    a_wins = rng.random(a.shape) < _sigmoid(strength[a] - strength[b])
+    return np.where(a_wins, a, b), np.where(a_wins, b, a)
+
+
+def simulate_shard(inputs: dict, n_sims: int, seed: np.random.SeedSequence) -> dict[str, np.ndarray]:
+    """Simulate n_sims seasons; returns per-team counts to be summed across shards."""
+    rng = np.random.default_rng(seed)
+    n_teams = inputs["n_teams"]
+    strength = inputs["strength"]
+    home, away, is_conf = inputs["home"], inputs["away"], inputs["is_conf"]
+
+    # Remaining regular season: one column per game.
+    home_wins = (rng.random((n_sims, home.size)) < inputs["p_home"]).astype(np.float32)
+    home_onehot = np.zeros((home.size, n_teams), dtype=np.float32)
+    away_onehot = np.zeros((home.size, n_teams), dtype=np.float32)
+    home_onehot[np.arange(home.size), home] = 1.0
+    away_onehot[np.arange(home.size), away] = 1.0
+    wins = inputs["fixed_wins"] + home_wins @ home_onehot + (1.0 - home_wins) @ away_onehot
+    # Remaining games against non-FBS opponents only move the FBS side's wins.
+    non_fbs_team = inputs["non_fbs_team"]
+    non_fbs_onehot = np.zeros((non_fbs_team.size, n_teams), dtype=np.float32)
+    non_fbs_onehot[np.arange(non_fbs_team.size), non_fbs_team] = 1.0
+    wins = wins + (rng.random((n_sims, non_fbs_team.size)) < inputs["non_fbs_p"]).astype(np.float32) @ non_fbs_onehot
+    conf_wins = (
+        inputs["fixed_conf_wins"]
+        + home_wins @ (home_onehot * is_conf[:, None])
+        + (1.0 - home_wins) @ (away_onehot * is_conf[:, None])
+    )
+    wins = wins.astype(np.int64)
+    games = np.broadcast_to(inputs["games_played"], wins.shape).astype(np.int64)
+
+    win_counts = np.zeros((n_teams, MAX_WINS + 1), dtype=np.int64)
+    np.add.at(win_counts, (np.broadcast_to(np.arange(n_teams), wins.shape), np.minimum(wins, MAX_WINS)), 1)
+
+    # Conference title games: top two by conference win%, then overall wins, then coin flip.
+    conf_pct = conf_wins / np.maximum(inputs["conf_games"], 1)
+    standing = conf_pct * 1000.0 + wins + rng.random(wins.shape) * 0.5
+    rows = np.arange(n_sims)
+    champions = np.full((n_sims, inputs["n_conferences"]), -1, dtype=np.int64)
+    for conf in range(inputs["n_conferences"]):
+        members = np.flatnonzero(inputs["team_conf"] == conf)
+        if members.size == 0:
+            continue
+        if members.size == 1:
+            champions[:, conf] = members[0]
+            continue
+        order = np.argsort(-standing[:, members], axis=1)
+        first, second = members[order[:, 0]], members[order[:, 1]]
+        winners, losers = _play(rng, strength, first, second)
+        champions[:, conf] = winners
+        wins[rows, winners] += 1
+        games[rows, winners] += 1
+        games[rows, losers] += 1
+    champions = champions[:, (champions >= 0).all(axis=0)]
+
+    # Playoff field: five best-ranked champions, then at-large by the same ranking.
+    resume = RESUME_WIN_WEIGHT * wins / np.maximum(games, 1) + strength
+    champ_resume = np.take_along_axis(resume, champions, axis=1)
+    auto_bids = np.take_along_axis(champions, np.argsort(-champ_resume, axis=1)[:, :PLAYOFF_AUTO_BIDS], axis=1)
+    boosted = resume.copy()
+    np.put_along_axis(boosted, auto_bids, np.inf, axis=1)
+    field = np.argsort(-boosted, axis=1)[:, :PLAYOFF_TEAMS]
+    seeds = np.take_along_axis(field, np.argsort(-np.take_along_axis(resume, field, axis=1), axis=1), axis=1)
+
+    # Bracket (0-based seeds): 4v11, 5v10, 6v9, 7v8; seed 0 meets the 7v8 winner, 3 the 4v11 winner.
+    first_round = {
+        high: _play(rng, strength, seeds[:, high], seeds[:, PLAYOFF_TEAMS - 1 + PLAYOFF_BYES - high])[0]
+        for high in range(PLAYOFF_BYES, 2 * PLAYOFF_BYES)
+    }
+    quarterfinals = [
+        _play(rng, strength, seeds[:, bye], first_round[2 * PLAYOFF_BYES - 1 - bye])[0]
+        for bye in range(PLAYOFF_BYES)
+    ]
+    semis = [
+        _play(rng, strength, quarterfinals[0], quarterfinals[3])[0],
+        _play(rng, strength, quarterfinals[1], quarterfinals[2])[0],
+    ]
+    national_champions, _ = _play(rng, strength, semis[0], semis[1])
+
+    return {
+        "win_counts": win_counts,
+        "conference_champion": np.bincount(champions.ravel(), minlength=n_teams),
+        "playoff": np.bincount(field.ravel(), minlength=n_teams),
+        "national_champion": np.bincount(national_champions, minlength=n_teams),
+    }
+
+
+def simulate_season(inputs: dict, n_sims: int, workers: int | None = None, seed: int | None = None) -> dict[str, np.ndarray]:
+    """Shard n_sims across a process pool and sum the counts."""
+    shards = [SHARD_SIMS] * (n_sims // SHARD_SIMS) + ([n_sims % SHARD_SIMS] if n_sims % SHARD_SIMS else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(shards))
+    totals: dict[str, np.ndarray] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for counts in pool.map(simulate_shard, [inputs] * len(shards), shards, seeds):
+            for key, value in counts.items():
+                totals[key] = totals[key] + value if key in totals else value
+    return totals
+
+
+def to_predictions(totals: dict[str, np.ndarray], teams: pd.DataFrame, season: int, n_sims: int, source: str) -> pd.DataFrame:
+    """One row per team in season_predictions_full's column shape (probabilities on 0-1)."""
+    out = teams[["team_id", "team"]].copy()
+    out.insert(0, "season", int(season))
+    out[WIN_COLUMNS] = totals["win_counts"] / n_sims
+    out["conference_champion_prob"] = totals["conference_champion"] / n_sims
+    out["playoff_prob"] = totals["playoff"] / n_sims
+    out["national_champion_prob"] = totals["national_champion"] / n_sims
+    out["n_sims"] = int(n_sims)
+    out["source"] = source
+    out["created_at"] = pd.Timestamp.now(tz="UTC")
+    return out
+
+
+# ============================
+# WRITE
+# ============================
+
+def _ensure_table(conn) -> None:
+    prob_columns = ",\n            ".join(f"{col} double precision NOT NULL" for col in WIN_COLUMNS + ODDS_COLUMNS)
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS public.{SIMULATED_PREDICTIONS_TABLE} (
+            season integer NOT NULL,
+            team_id text NOT NULL,
+            team text NOT NULL,
+            {prob_columns},
+            n_sims integer NOT NULL,
+            source text NOT NULL,
+            created_at timestamptz NOT NULL,
+            PRIMARY KEY (season, team_id)
+        )
+    """))
+
+
+def write_predictions(predictions: pd.DataFrame, season: int) -> None:
+    """Swap the season's rows in one transaction so readers never see a partial run."""
+    with get_source_engine().begin() as conn:
+        _ensure_table(conn)
+        conn.execute(text(f"DELETE FROM public.{SIMULATED_PREDICTIONS_TABLE} WHERE season = :season"), {"season": int(season)})
+        predictions.to_sql(SIMULATED_PREDICTIONS_TABLE, conn, schema="public", if_exists="append", index=False, method="multi")
+
+
+def current_season() -> int:
+    df = _read_source(
+        """
+        SELECT MAX(season)::int AS season
+        FROM public.game_data
+        WHERE startdate IS NOT NULL
+          AND (homeclassification = 'fbs' OR awayclassification = 'fbs')
+        """
+    )
+    return int(df["season"].iloc[0])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate the rest of the season and store team odds.")
+    parser.add_argument("--season", type=int, help="Season to simulate (default: latest on the schedule).")
+    parser.add_argument("--sims", type=int, default=20_000, help="Number of simulated seasons.")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs.")
+    parser.add_argument("--rating-model", help="Price games off this team_ratings model instead of game predictions.")
+    args = parser.parse_args()
+
+    season = args.season or current_season()
+    started = time.monotonic()
+    ratings = load_ratings(args.rating_model) if args.rating_model else None
+    inputs, teams = build_inputs(load_schedule(season), ratings)
+    totals = simulate_season(inputs, args.sims, workers=args.workers, seed=args.seed)
+    source = f"ratings:{args.rating_model}" if args.rating_model else "game_predictions"
+    write_predictions(to_predictions(totals, teams, season, args.sims, source), season)
+    print(f"Simulated {args.sims:,} {season} seasons for {len(teams)} teams in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Fingerprinted static assets for the app shell.
+
+Build (run from the app/ directory; the app also builds on first start):
+
+    python -m utils.static_assets
+
+Sources:
+
+    styles/*.css              concatenated, in name order, into one stylesheet
+    assets/logo_color.PNG     sidebar logo
+
+Output under static/build/ (served by Streamlit at app/static/build/...):
+
+    app.<hash>.css
+    logo_color.<hash>.png
+    manifest.json             {logical name: fingerprinted file name}
+
+Third-party bundles live in static/vendor/<name>-<version>/ (committed as-is,
+served at app/static/vendor/...); the version in the path plays the same role.
+
+Names carry a hash of their bytes, so a changed file gets a new URL and
+browsers can keep any given URL cached indefinitely. Requires
+server.enableStaticServing (see .streamlit/config.toml).
+"""
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import streamlit as st
+
+APP_DIR = Path(__file__).resolve().parent.parent
+STYLES_DIR = APP_DIR / "styles"
+STATIC_DIR = APP_DIR / "static"
+BUILD_DIR = STATIC_DIR / "build"
+STATIC_URL_PREFIX = "app/static/build"
+VENDOR_URL_PREFIX = "app/static/vendor"
+
+LOGO_SOURCE = APP_DIR / "assets" / "logo_color.PNG"
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _write_fingerprinted(build_dir: Path, stem: str, suffix: str, data: bytes) -> str:
+    name = f"{stem}.{fingerprint(data)}{suffix}"
+    path = build_dir / name
+    if not path.exists():
+        tmp_path = path.with_name(name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    return name
+
+
+def build_static_assets(build_dir: Path = BUILD_DIR) -> dict[str, str]:
+    """Write fingerprinted assets (only those not built yet) and return the manifest."""
+    build_dir.mkdir(parents=True, exist_ok=True)
+
+    css = "\n".join(path.read_text() for path in sorted(STYLES_DIR.glob("*.css")))
+    manifest = {
+        "app.css": _write_fingerprinted(build_dir, "app", ".css", css.encode("utf-8")),
+        "logo_color.png": _write_fingerprinted(build_dir, "logo_color", ".png", LOGO_SOURCE.read_bytes()),
+    }
+
+    # Drop superseded builds so the directory doesn't grow with every edit.
+    current = set(manifest.values()) | {"manifest.json"}
+    for path in build_dir.iterdir():
+        if path.name not in current:
+            path.unlink()
+
+    (build_dir / "manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+@st.cache_resource
+def get_static_manifest() -> dict[str, str]:
+    """Built once per process; sources only change on deploy."""
+    return build_static_assets()
+
+
+def static_url(name: str) -> str:
+    """Served URL for a logical asset name, e.g. static_url("app.css")."""
+    return f"{STATIC_URL_PREFIX}/{get_static_manifest()[name]}"
+
+
+def served_url(path: Path) -> str:
+    """Served URL for any file under static/, e.g. a logo variant."""
+    return "app/static/" + path.resolve().relative_to(STATIC_DIR).as_posix()
+
+
+def vendor_url(path: str) -> str:
+    """Served URL for a committed vendor file, e.g. vendor_url("leaflet-1.9.3/leaflet.js")."""
+    return f"{VENDOR_URL_PREFIX}/{path}"
+
+
+def stylesheet_html() -> str:
+    """Tiny <style> that imports the shared stylesheet; the browser fetches it once."""
+    return f'<style>@import url("{static_url("app.css")}");</style>'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build fingerprinted static assets for the app shell.")
+    parser.parse_args()
+
+    manifest = build_static_assets()
+    for name, built in sorted(manifest.items()):
+        print(f"{name} -> {STATIC_URL_PREFIX}/{built}")
+
+
+if __name__ == "__main__":
+    main()
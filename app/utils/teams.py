@@ -0,0 +1,157 @@
+import pandas as pd
+import streamlit as st
+from utils.db import read_df
+from utils.query_cache import WATERMARKS
+
+
+def get_game_data_watermark() -> str:
+    """Cheap fingerprint of game_data; moves when games are added, rescheduled or scored."""
+    return get_watermark("game_data")
+
+
+def get_watermark(name: str) -> str:
+    """Current value of one of the WATERMARKS, as a string usable as a cache key."""
+    # Cached until the background watermark poll sees the table move.
+    df = read_df(WATERMARKS[name])
+    return "|".join(str(v) for v in df.iloc[0].tolist()) if not df.empty else ""
+
+
+@st.cache_resource(max_entries=1)
+def _build_team_dimension(watermark: str) -> pd.DataFrame:
+    """One row per FBS team; rebuilt only when the game_data watermark moves."""
+    return read_df(
+        """
+        WITH sides AS (
+            SELECT hometeam AS team, homeid AS team_id, homeconference AS conference, season
+            FROM public.game_data
+            WHERE startdate IS NOT NULL
+              AND homeclassification = 'fbs'
+              AND awayclassification = 'fbs'
+
+            UNION ALL
+
+            SELECT awayteam AS team, awayid AS team_id, awayconference AS conference, season
+            FROM public.game_data
+            WHERE startdate IS NOT NULL
+              AND homeclassification = 'fbs'
+              AND awayclassification = 'fbs'
+        ),
+        latest AS (
+            SELECT DISTINCT ON (team)
+                team,
+                team_id::text AS team_id,
+                conference
+            FROM sides
+            WHERE team IS NOT NULL
+            ORDER BY team, season DESC
+        ),
+        active AS (
+            SELECT
+                team,
+                MIN(season)::int AS first_season,
+                MAX(season)::int AS last_season,
+                ARRAY_AGG(DISTINCT season::int ORDER BY season::int) AS seasons
+            FROM sides
+            WHERE team IS NOT NULL
+            GROUP BY team
+        )
+        SELECT
+            l.team,
+            l.team_id,
+            l.conference,
+            tm."Color" AS color,
+            tm."Logo" AS logo,
+            a.first_season,
+            a.last_season,
+            a.seasons
+        FROM latest l
+        JOIN active a
+          ON a.team = l.team
+        LEFT JOIN public.team_map tm
+          ON tm."Id"::text = l.team_id
+        ORDER BY l.team
+        """
+    )
+
+
+def get_team_dimension() -> pd.DataFrame:
+    """Shared team dimension: team, team_id, conference, color, logo, first/last season, seasons.
+
+    The frame is shared across sessions, so treat it as read-only.
+    """
+    return _build_team_dimension(get_game_data_watermark())
+
+
+def get_team_names() -> list[str]:
+    """Sorted FBS team names for team pickers."""
+    return sorted(get_team_dimension()["team"].dropna())
+
+
+def get_current_season() -> int:
+    """Most recent season with an FBS vs FBS game on the schedule."""
+    return int(get_team_dimension()["last_season"].max())
+
+
+# ----------------------------
+# Team metadata lookups
+# ----------------------------
+DEFAULT_TEAM_HEX = "#4C78A8"
+
+
+@st.cache_resource(max_entries=1)
+def _build_team_metadata(watermark: str) -> dict[str, dict]:
+    """Hash maps over team_map: by game_data team name (via team id) and by cfb_name."""
+    team_map = read_df(
+        """
+        SELECT
+            "Id"::text AS team_id,
+            cfb_name,
+            "Color" AS color,
+            "Logo" AS logo
+        FROM public.team_map
+        """
+    )
+    team_map = team_map.astype(object).where(team_map.notna(), None)
+    records = team_map.to_dict("records")
+    by_id = {r["team_id"]: r for r in records if r["team_id"] is not None}
+    by_cfb_name = {r["cfb_name"]: r for r in records if r["cfb_name"] is not None}
+
+    dimension = _build_team_dimension(watermark)
+    by_team = {
+        team: by_id.get(team_id, {"team_id": team_id, "cfb_name": None, "color": None, "logo": None})
+        for team, team_id in zip(dimension["team"], dimension["team_id"])
+    }
+    logo_by_cfb_name = {name: r["logo"] for name, r in by_cfb_name.items()}
+    return {"by_team": by_team, "by_cfb_name": by_cfb_name, "logo_by_cfb_name": logo_by_cfb_name}
+
+
+def get_team_metadata() -> dict[str, dict]:
+    """Shared, read-only team metadata maps (no database round trip once built)."""
+    return _build_team_metadata(get_game_data_watermark())
+
+
+def get_team_hex(team: str | None) -> str:
+    """Hex color for a game_data team name."""
+    if not team:
+        return DEFAULT_TEAM_HEX
+    meta = get_team_metadata()["by_team"].get(team) or {}
+    return meta.get("color") or DEFAULT_TEAM_HEX
+
+
+def get_team_id(team: str | None) -> str | None:
+    """team_map / game_data id for a game_data team name."""
+    if not team:
+        return None
+    return (get_team_metadata()["by_team"].get(team) or {}).get("team_id")
+
+
+def get_team_logo(team: str | None) -> str | None:
+    """Logo URL for a game_data team name."""
+    if not team:
+        return None
+    return (get_team_metadata()["by_team"].get(team) or {}).get("logo")
+
+
+def get_logo_by_cfb_name() -> dict[str, str | None]:
+    """{team_map.cfb_name: Logo} for pages keyed on team_map names (rankings, ratings)."""
+    return get_team_metadata()["logo_by_cfb_name"]
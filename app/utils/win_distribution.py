@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+MAX_REGULAR_SEASON_WINS = 13
+
+# Win probability for a remaining game against a non-FBS opponent when the
+# game model has no prediction for it (it only prices FBS-vs-FBS games).
+NON_FBS_OPPONENT_WIN_PROB = 0.95
+
+
+def poisson_binomial(probs: np.ndarray, base_wins: np.ndarray | None = None, max_wins: int = MAX_REGULAR_SEASON_WINS) -> np.ndarray:
+    """Exact win-count distributions for many teams at once.
+
+    probs is (teams, games) with NaN padding for teams with fewer games left;
+    base_wins shifts each row by wins already banked. Returns (teams, max_wins + 1),
+    with anything above max_wins folded into the last bucket.
+    """
+    probs = np.atleast_2d(np.asarray(probs, dtype=float))
+    n_teams, n_games = probs.shape
+    dist = np.zeros((n_teams, n_games + 1))
+    dist[:, 0] = 1.0
+    for j in range(n_games):
+        # NaN padding acts as a certain loss, which leaves the row unchanged.
+        p = np.nan_to_num(probs[:, j], nan=0.0)[:, None]
+        dist[:, 1 : j + 2] = dist[:, 1 : j + 2] * (1.0 - p) + dist[:, : j + 1] * p
+        dist[:, 0] *= 1.0 - p[:, 0]
+
+    if base_wins is None:
+        base_wins = np.zeros(n_teams, dtype=int)
+    base_wins = np.asarray(base_wins, dtype=int)
+
+    out = np.zeros((n_teams, max_wins + 1))
+    wins = np.arange(n_games + 1)[None, :] + base_wins[:, None]
+    rows = np.broadcast_to(np.arange(n_teams)[:, None], wins.shape)
+    np.add.at(out, (rows, np.minimum(wins, max_wins)), dist)
+    return out
+
+
+def win_distributions(outcomes: pd.DataFrame, max_wins: int = MAX_REGULAR_SEASON_WINS) -> pd.DataFrame:
+    """Batched distributions from long-format outcomes (team, won, win_prob).
+
+    Played games carry `won` (bool); remaining games carry `win_prob` (0-1).
+    Teams with a remaining game that has no probability are left out, since
+    their distribution can't be computed exactly. Returns one row per team
+    with columns 0..max_wins.
+    """
+    columns = list(range(max_wins + 1))
+    if outcomes.empty:
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    played = outcomes["won"].notna()
+    remaining = outcomes.loc[~played]
+    incomplete = remaining.loc[remaining["win_prob"].isna(), "team"].unique()
+    outcomes = outcomes[~outcomes["team"].isin(incomplete)]
+    played = outcomes["won"].notna()
+    if outcomes.empty:
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    teams = pd.Index(outcomes["team"].unique())
+    base_wins = (
+        outcomes.loc[played & outcomes["won"].astype("boolean").fillna(False), "team"]
+        .value_counts()
+        .reindex(teams, fill_value=0)
+        .to_numpy()
+    )
+
+    remaining = outcomes.loc[~played, ["team", "win_prob"]]
+    slot = remaining.groupby("team").cumcount().to_numpy()
+    probs = np.full((len(teams), int(slot.max()) + 1 if len(slot) else 0), np.nan)
+    probs[teams.get_indexer(remaining["team"]), slot] = remaining["win_prob"].to_numpy(dtype=float)
+
+    return pd.DataFrame(poisson_binomial(probs, base_wins, max_wins), index=teams, columns=columns)
+
+
+def team_schedule_outcomes(games: pd.DataFrame, team: str, season: int) -> pd.DataFrame:
+    """Long-format outcomes for one team's regular season from a game_data-shaped frame.
+
+    Expects hometeam/awayteam/homepoints/awaypoints/season plus a `teamwinprob`
+    column (the team's side of the latest game prediction). Pass the full
+    schedule: games against non-FBS opponents count toward wins, and remaining
+    ones without a prediction use NON_FBS_OPPONENT_WIN_PROB (needs the
+    home/awayclassification columns).
+    """
+    if games.empty:
+        return pd.DataFrame(columns=["team", "game_id", "won", "win_prob"])
+
+    games = games[pd.to_numeric(games["season"], errors="coerce") == int(season)]
+    if "seasontype" in games.columns:
+        games = games[games["seasontype"].astype(str).str.lower() != "postseason"]
+
+    is_home = games["hometeam"] == team
+    team_points = pd.to_numeric(games["homepoints"].where(is_home, games["awaypoints"]), errors="coerce")
+    opp_points = pd.to_numeric(games["awaypoints"].where(is_home, games["homepoints"]), errors="coerce")
+    played = team_points.notna() & opp_points.notna()
+
+    win_prob = pd.to_numeric(games["teamwinprob"], errors="coerce")
+    win_prob = win_prob.where(win_prob <= 1, win_prob / 100.0).clip(0.0, 1.0)
+    if {"homeclassification", "awayclassification"} <= set(games.columns):
+        opp_class = games["awayclassification"].where(is_home, games["homeclassification"])
+        win_prob = win_prob.mask(win_prob.isna() & (opp_class.astype(str).str.lower() != "fbs"), NON_FBS_OPPONENT_WIN_PROB)
+    return pd.DataFrame(
+        {
+            "team": team,
+            "game_id": games["id"].astype(str) if "id" in games.columns else games.index.astype(str),
+            "won": (team_points > opp_points).astype(object).where(played, None),
+            "win_prob": win_prob.where(~played),
+        }
+    )
+
+
+# ----------------------------
+# Incremental updates (what-if)
+# ----------------------------
+def team_win_distribution(outcomes: pd.DataFrame) -> np.ndarray | None:
+    """Unfolded distribution (index = wins) for one team's outcomes; None if a remaining game has no probability."""
+    played = outcomes["won"].notna()
+    remaining = outcomes.loc[~played, "win_prob"].to_numpy(dtype=float)
+    if np.isnan(remaining).any():
+        return None
+    base = int(outcomes.loc[played, "won"].astype(bool).sum())
+    return poisson_binomial(remaining[None, :], np.array([base]), max_wins=base + remaining.size)[0]
+
+
+def add_game(dist: np.ndarray, p: float) -> np.ndarray:
+    """Multiply one game's factor (1 - p + p*x) into the distribution."""
+    out = np.zeros(dist.size + 1)
+    out[:-1] = dist * (1.0 - p)
+    out[1:] += dist * p
+    return out
+
+
+def remove_game(dist: np.ndarray, p: float) -> np.ndarray:
+    """Divide one game's factor back out of the distribution.
+
+    Runs forward when p <= 0.5 and backward otherwise, so every step divides
+    by max(p, 1 - p) >= 0.5 and rounding error stays bounded.
+    """
+    n = dist.size - 1
+    q = 1.0 - p
+    out = np.zeros(n)
+    if p <= 0.5:
+        out[0] = dist[0] / q
+        for k in range(1, n):
+            out[k] = (dist[k] - p * out[k - 1]) / q
+    else:
+        out[n - 1] = dist[n] / p
+        for k in range(n - 1, 0, -1):
+            out[k - 1] = (dist[k] - q * out[k]) / p
+    out = np.clip(out, 0.0, None)
+    total = out.sum()
+    return out / total if total > 0 else out
+
+
+def fold_wins(dist: np.ndarray, max_wins: int = MAX_REGULAR_SEASON_WINS) -> np.ndarray:
+    """Fold an unfolded distribution into 0..max_wins buckets."""
+    out = np.zeros(max_wins + 1)
+    np.add.at(out, np.minimum(np.arange(dist.size), max_wins), dist)
+    return out